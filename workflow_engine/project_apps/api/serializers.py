@@ -5,7 +5,7 @@ def serialize_workflow(workflow_info, jobs_data):
     if type(workflow_info) is dict:
         raise ValueError("요청받은 workflow 정보의 형식이 올바르지 않습니다.")
     
-    if type(jobs_data[0]) is dict:
+    if jobs_data and type(jobs_data[0]) is dict:
         raise ValueError("요청받은 job 정보의 형식이 올바르지 않습니다.")
     
     serialized_jobs = []
@@ -14,21 +14,41 @@ def serialize_workflow(workflow_info, jobs_data):
             'uuid': job_data.uuid,
             'name': job_data.name,
             'image': job_data.image,
+            'runtime': job_data.runtime,
+            'command': job_data.command,
             'parameters': job_data.parameters,
             'next_job_names': job_data.next_job_names,
             'depends_count': job_data.depends_count,
             'timeout': job_data.timeout,
-            'retries': job_data.retries
+            'retries': job_data.retries,
+            'retry_delay': job_data.retry_delay,
+            'retry_backoff': job_data.retry_backoff,
+            'retry_jitter': job_data.retry_jitter,
+            'estimated_duration': job_data.estimated_duration,
+            'cpu': job_data.cpu,
+            'memory': job_data.memory
         }
         serialized_jobs.append(serialized_job)
 
+    serialized_workflow = serialize_workflow_info(workflow_info)
+    serialized_workflow['jobs'] = serialized_jobs
+
+    return serialized_workflow
+
+def serialize_workflow_info(workflow_info):
+    '''
+    입력받은 Workflow 모델 객체를 Job 리스트 없이 직렬화한다.
+    '''
+    if type(workflow_info) is dict:
+        raise ValueError("요청받은 workflow 정보의 형식이 올바르지 않습니다.")
+
     serialized_workflow = {
         'uuid': workflow_info.uuid,
         'name': workflow_info.name,
         'description': workflow_info.description,
+        'max_concurrent_runs': workflow_info.max_concurrent_runs,
         'created_at': workflow_info.created_at,
-        'updated_at': workflow_info.updated_at,
-        'jobs': serialized_jobs
+        'updated_at': workflow_info.updated_at
     }
 
     return serialized_workflow
@@ -41,8 +61,15 @@ def serialize_scheduling(scheduling_info):
         'uuid': scheduling_info.uuid,
         'scheduled_at': scheduling_info.scheduled_at,
         'interval': scheduling_info.interval,
+        'cron': scheduling_info.cron,
+        'timezone': scheduling_info.timezone,
+        'calendar': scheduling_info.calendar,
         'repeat_count': scheduling_info.repeat_count,
+        'run_count': scheduling_info.run_count,
+        'misfire_policy': scheduling_info.misfire_policy,
         'is_active': scheduling_info.is_active,
+        'next_run_at': scheduling_info.next_run_at,
+        'fire_times': scheduling_info.fire_times,
         'created_at': scheduling_info.created_at,
         'updated_at': scheduling_info.updated_at
     }
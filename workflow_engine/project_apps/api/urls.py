@@ -11,4 +11,5 @@ urlpatterns = [
     path('scheduling/workflow/<uuid:workflow_uuid>', SchedulingWorkflowAPIView.as_view()),
     path('scheduling/<uuid:scheduling_uuid>/execute', SchedulingExecuteAPIView.as_view()),
     path('scheduling/<uuid:scheduling_uuid>/deactive', SchedulingDeactivateAPIView.as_view()),
+    path('metrics', MetricsAPIView.as_view()),
 ]
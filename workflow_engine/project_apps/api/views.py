@@ -5,6 +5,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from project_apps.service.metrics_service import MetricsService
 from project_apps.service.workflow_service import WorkflowService
 from project_apps.service.scheduling_service import SchedulingService
 
@@ -23,6 +24,7 @@ class WorkflowAPIView(APIView):
         properties={
             'name': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 이름'),
             'description': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 내용'),
+            'max_concurrent_runs': openapi.Schema(type=openapi.TYPE_INTEGER, description='동시에 실행할 수 있는 최대 실행 수 (0은 무제한)', default=0),
             'jobs': openapi.Schema(
                 type=openapi.TYPE_ARRAY,
                 description='Job 목록',
@@ -32,6 +34,8 @@ class WorkflowAPIView(APIView):
                     properties={
                         'name': openapi.Schema(type=openapi.TYPE_STRING, description='Job 이름'),
                         'image': openapi.Schema(type=openapi.TYPE_STRING, description='실행할 컨테이너 이미지'),
+                        'runtime': openapi.Schema(type=openapi.TYPE_STRING, description='Job 실행 런타임: docker, subprocess'),
+                        'command': openapi.Schema(type=openapi.TYPE_ARRAY, description='subprocess 런타임에서 실행할 명령, docker 런타임에서는 이미지의 Cmd를 대체', items=openapi.Items(type=openapi.TYPE_STRING)),
                         'parameters': openapi.Schema(
                             type=openapi.TYPE_OBJECT, 
                             description='Job 실행에 필요한 파라미터', 
@@ -54,6 +58,36 @@ class WorkflowAPIView(APIView):
                             description='Job 실패 시 재시도 횟수', 
                             default=0
                         ),
+                        'retry_delay': openapi.Schema(
+                            type=openapi.TYPE_INTEGER, 
+                            description='첫 재시도까지의 대기 시간(초)', 
+                            default=1
+                        ),
+                        'retry_backoff': openapi.Schema(
+                            type=openapi.TYPE_NUMBER, 
+                            description='재시도마다 대기 시간에 곱하는 배수', 
+                            default=2.0
+                        ),
+                        'retry_jitter': openapi.Schema(
+                            type=openapi.TYPE_NUMBER, 
+                            description='대기 시간에 무작위로 더하거나 빼는 비율(0~1)', 
+                            default=0.1
+                        ),
+                        'estimated_duration': openapi.Schema(
+                            type=openapi.TYPE_NUMBER, 
+                            description='실행 기록이 없을 때 우선순위 계산에 사용할 예상 실행 시간(초)', 
+                            default=0
+                        ),
+                        'cpu': openapi.Schema(
+                            type=openapi.TYPE_NUMBER, 
+                            description='Job이 사용할 CPU 코어 수. 0이면 제한과 자원 예약 없이 실행한다.', 
+                            default=0
+                        ),
+                        'memory': openapi.Schema(
+                            type=openapi.TYPE_INTEGER, 
+                            description='Job이 사용할 메모리(MB). 0이면 제한과 자원 예약 없이 실행한다.', 
+                            default=0
+                        ),
                     },
                 ),
             ),
@@ -71,13 +105,14 @@ class WorkflowAPIView(APIView):
         name = request.data.get('name')
         description = request.data.get('description')
         jobs_data = request.data.get('jobs', [])
+        max_concurrent_runs = request.data.get('max_concurrent_runs', 0)
 
         if not name or not description:
             return Response({'error': 'name and description are required.'}, status=status.HTTP_400_BAD_REQUEST)
 
         workflow_service = WorkflowService()
         try:
-            workflow = workflow_service.create_workflow(name, description, jobs_data)
+            workflow = workflow_service.create_workflow(name, description, jobs_data, max_concurrent_runs)
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -85,49 +120,105 @@ class WorkflowAPIView(APIView):
 
     @swagger_auto_schema(
     operation_summary="전체 워크플로우 조회",
-    operation_description="모든 워크플로우와 각각의 Job 리스트를 반환합니다.",
+    operation_description="워크플로우와 각각의 Job 리스트를 생성 순서대로 페이지 단위로 반환합니다.",
+    manual_parameters=[
+        openapi.Parameter(
+            name='cursor',
+            in_=openapi.IN_QUERY,
+            description="이전 응답의 next_cursor. 생략하면 첫 페이지를 반환",
+            required=False,
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            name='limit',
+            in_=openapi.IN_QUERY,
+            description="한 페이지의 워크플로우 수 (기본값: 서버 설정)",
+            required=False,
+            type=openapi.TYPE_INTEGER
+        ),
+        openapi.Parameter(
+            name='include_jobs',
+            in_=openapi.IN_QUERY,
+            description="각 워크플로우의 Job 리스트를 포함할지 여부 (기본값: true)",
+            required=False,
+            type=openapi.TYPE_BOOLEAN
+        )
+    ],
     responses={
         status.HTTP_200_OK: openapi.Response(
             description="모든 워크플로우 리스트 반환 성공",
             schema=openapi.Schema(
-                type=openapi.TYPE_ARRAY,
-                items=openapi.Items(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'uuid': openapi.Schema(type=openapi.TYPE_STRING, format='uuid', description='워크플로우 UUID'),
-                        'name': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 이름'),
-                        'description': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 설명'),
-                        'jobs': openapi.Schema(
-                            type=openapi.TYPE_ARRAY,
-                            description='워크플로우에 속한 Job 목록',
-                            items=openapi.Items(
-                                type=openapi.TYPE_OBJECT,
-                                properties={
-                                    'name': openapi.Schema(type=openapi.TYPE_STRING, description='Job 이름'),
-                                    'image': openapi.Schema(type=openapi.TYPE_STRING, description='실행할 컨테이너 이미지'),
-                                    'parameters': openapi.Schema(
-                                        type=openapi.TYPE_OBJECT, 
-                                        description='Job 실행에 필요한 파라미터', 
-                                        additional_properties=True
-                                    ),
-                                    'next_job_names': openapi.Schema(
-                                        type=openapi.TYPE_ARRAY, 
-                                        description='다음에 실행될 Job 이름 목록',
-                                        items=openapi.Items(type=openapi.TYPE_STRING)
-                                    ),
-                                    'timeout': openapi.Schema(
-                                        type=openapi.TYPE_INTEGER, 
-                                        description='Job의 최대 실행 시간(초)'
-                                    ),
-                                    'retries': openapi.Schema(
-                                        type=openapi.TYPE_INTEGER, 
-                                        description='Job 실패 시 재시도 횟수'
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'results': openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Items(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                'uuid': openapi.Schema(type=openapi.TYPE_STRING, format='uuid', description='워크플로우 UUID'),
+                                'name': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 이름'),
+                                'description': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 설명'),
+                                'max_concurrent_runs': openapi.Schema(type=openapi.TYPE_INTEGER, description='최대 동시 실행 수'),
+                                'jobs': openapi.Schema(
+                                    type=openapi.TYPE_ARRAY,
+                                    description='워크플로우에 속한 Job 목록',
+                                    items=openapi.Items(
+                                        type=openapi.TYPE_OBJECT,
+                                        properties={
+                                            'name': openapi.Schema(type=openapi.TYPE_STRING, description='Job 이름'),
+                                            'image': openapi.Schema(type=openapi.TYPE_STRING, description='실행할 컨테이너 이미지'),
+                                            'runtime': openapi.Schema(type=openapi.TYPE_STRING, description='Job 실행 런타임: docker, subprocess'),
+                                            'command': openapi.Schema(type=openapi.TYPE_ARRAY, description='subprocess 런타임에서 실행할 명령, docker 런타임에서는 이미지의 Cmd를 대체', items=openapi.Items(type=openapi.TYPE_STRING)),
+                                            'parameters': openapi.Schema(
+                                                type=openapi.TYPE_OBJECT, 
+                                                description='Job 실행에 필요한 파라미터', 
+                                                additional_properties=True
+                                            ),
+                                            'next_job_names': openapi.Schema(
+                                                type=openapi.TYPE_ARRAY, 
+                                                description='다음에 실행될 Job 이름 목록',
+                                                items=openapi.Items(type=openapi.TYPE_STRING)
+                                            ),
+                                            'timeout': openapi.Schema(
+                                                type=openapi.TYPE_INTEGER, 
+                                                description='Job의 최대 실행 시간(초)'
+                                            ),
+                                            'retries': openapi.Schema(
+                                                type=openapi.TYPE_INTEGER, 
+                                                description='Job 실패 시 재시도 횟수'
+                                            ),
+                                            'retry_delay': openapi.Schema(
+                                                type=openapi.TYPE_INTEGER, 
+                                                description='첫 재시도까지의 대기 시간(초)'
+                                            ),
+                                            'retry_backoff': openapi.Schema(
+                                                type=openapi.TYPE_NUMBER, 
+                                                description='재시도마다 대기 시간에 곱하는 배수'
+                                            ),
+                                            'retry_jitter': openapi.Schema(
+                                                type=openapi.TYPE_NUMBER, 
+                                                description='대기 시간에 무작위로 더하거나 빼는 비율'
+                                            ),
+                                            'estimated_duration': openapi.Schema(
+                                                type=openapi.TYPE_NUMBER, 
+                                                description='예상 실행 시간(초)'
+                                            ),
+                                            'cpu': openapi.Schema(
+                                                type=openapi.TYPE_NUMBER, 
+                                                description='CPU 코어 수'
+                                            ),
+                                            'memory': openapi.Schema(
+                                                type=openapi.TYPE_INTEGER, 
+                                                description='메모리(MB)'
+                                            ),
+                                        },
                                     ),
-                                },
-                            ),
+                                ),
+                            },
                         ),
-                    },
-                ),
+                    ),
+                    'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, description='다음 페이지 조회에 사용할 cursor. 마지막 페이지라면 null'),
+                },
             )
         ),
         status.HTTP_400_BAD_REQUEST: openapi.Response(description="잘못된 요청")
@@ -135,10 +226,19 @@ class WorkflowAPIView(APIView):
     )
     def get(self, request):
         '''
-        모든 Workflow의 리스트를 반환한다.
+        Workflow 리스트를 페이지 단위로 반환한다.
         '''
+        cursor = request.query_params.get('cursor')
+        include_jobs = request.query_params.get('include_jobs', 'true').lower() in ('true', '1')
+
         workflow_service = WorkflowService()
-        workflow_list = workflow_service.get_workflow_list()
+        try:
+            limit = request.query_params.get('limit')
+            if limit is not None:
+                limit = int(limit)
+            workflow_list = workflow_service.get_workflow_list(cursor, limit, include_jobs)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response(workflow_list, status=status.HTTP_200_OK)
 
@@ -168,6 +268,7 @@ class WorkflowUUIDAPIView(APIView):
                     properties={
                         'name': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 이름'),
                         'description': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우 설명'),
+                        'max_concurrent_runs': openapi.Schema(type=openapi.TYPE_INTEGER, description='최대 동시 실행 수'),
                         'jobs': openapi.Schema(
                             type=openapi.TYPE_ARRAY,
                             description='워크플로우에 포함된 Job 목록',
@@ -177,6 +278,8 @@ class WorkflowUUIDAPIView(APIView):
                                     'uuid': openapi.Schema(type=openapi.TYPE_STRING, format='uuid', description='Job UUID'),
                                     'name': openapi.Schema(type=openapi.TYPE_STRING, description='Job 이름'),
                                     'image': openapi.Schema(type=openapi.TYPE_STRING, description='실행 이미지'),
+                                    'runtime': openapi.Schema(type=openapi.TYPE_STRING, description='Job 실행 런타임'),
+                                    'command': openapi.Schema(type=openapi.TYPE_ARRAY, description='Job 실행 명령', items=openapi.Items(type=openapi.TYPE_STRING)),
                                     'parameters': openapi.Schema(
                                         type=openapi.TYPE_OBJECT,
                                         description='Job 실행 파라미터',
@@ -195,6 +298,30 @@ class WorkflowUUIDAPIView(APIView):
                                         type=openapi.TYPE_INTEGER,
                                         description='실패 시 재시도 횟수'
                                     ),
+                                    'retry_delay': openapi.Schema(
+                                        type=openapi.TYPE_INTEGER,
+                                        description='첫 재시도까지의 대기 시간(초)'
+                                    ),
+                                    'retry_backoff': openapi.Schema(
+                                        type=openapi.TYPE_NUMBER,
+                                        description='재시도마다 대기 시간에 곱하는 배수'
+                                    ),
+                                    'retry_jitter': openapi.Schema(
+                                        type=openapi.TYPE_NUMBER,
+                                        description='대기 시간에 무작위로 더하거나 빼는 비율'
+                                    ),
+                                    'estimated_duration': openapi.Schema(
+                                        type=openapi.TYPE_NUMBER,
+                                        description='예상 실행 시간(초)'
+                                    ),
+                                    'cpu': openapi.Schema(
+                                        type=openapi.TYPE_NUMBER,
+                                        description='CPU 코어 수'
+                                    ),
+                                    'memory': openapi.Schema(
+                                        type=openapi.TYPE_INTEGER,
+                                        description='메모리(MB)'
+                                    ),
                                 }
                             )
                         ),
@@ -238,6 +365,7 @@ class WorkflowUUIDAPIView(APIView):
             properties={
                 'name': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우의 새 이름'),
                 'description': openapi.Schema(type=openapi.TYPE_STRING, description='워크플로우의 새 설명'),
+                'max_concurrent_runs': openapi.Schema(type=openapi.TYPE_INTEGER, description='워크플로우의 새 최대 동시 실행 수 (0은 무제한)'),
                 'jobs': openapi.Schema(
                     type=openapi.TYPE_ARRAY,
                     description='업데이트할 작업(Job)들의 목록',
@@ -248,6 +376,8 @@ class WorkflowUUIDAPIView(APIView):
                             'uuid': openapi.Schema(type=openapi.TYPE_STRING, format='uuid', description='작업의 UUID'),
                             'name': openapi.Schema(type=openapi.TYPE_STRING, description='작업의 새 이름'),
                             'image': openapi.Schema(type=openapi.TYPE_STRING, description='작업의 새 이미지'),
+                            'runtime': openapi.Schema(type=openapi.TYPE_STRING, description='작업의 새 실행 런타임'),
+                            'command': openapi.Schema(type=openapi.TYPE_ARRAY, description='작업의 새 실행 명령', items=openapi.Items(type=openapi.TYPE_STRING)),
                             'parameters': openapi.Schema(
                                 type=openapi.TYPE_OBJECT, 
                                 description='작업의 새 파라미터'
@@ -259,6 +389,12 @@ class WorkflowUUIDAPIView(APIView):
                             ),
                             'timeout': openapi.Schema(type=openapi.TYPE_INTEGER, description='작업의 새 최대 실행 시간(초)'),
                             'retries': openapi.Schema(type=openapi.TYPE_INTEGER, description='작업의 새 실패 시 재시도 횟수'),
+                            'retry_delay': openapi.Schema(type=openapi.TYPE_INTEGER, description='작업의 새 첫 재시도 대기 시간(초)'),
+                            'retry_backoff': openapi.Schema(type=openapi.TYPE_NUMBER, description='작업의 새 재시도 대기 시간 배수'),
+                            'retry_jitter': openapi.Schema(type=openapi.TYPE_NUMBER, description='작업의 새 재시도 대기 시간 무작위 비율'),
+                            'estimated_duration': openapi.Schema(type=openapi.TYPE_NUMBER, description='작업의 새 예상 실행 시간(초)'),
+                            'cpu': openapi.Schema(type=openapi.TYPE_NUMBER, description='작업의 새 CPU 코어 수'),
+                            'memory': openapi.Schema(type=openapi.TYPE_INTEGER, description='작업의 새 메모리(MB)'),
                         },
                     ),
                 ),
@@ -346,14 +482,30 @@ class WorkflowExecuteAPIView(APIView):
                 required=True,
                 type=openapi.TYPE_STRING,
                 format='uuid'
+            ),
+            openapi.Parameter(
+                name='prewarm',
+                in_=openapi.IN_QUERY,
+                description="후행 Job들의 이미지를 미리 받아둘지 여부 (기본값: 서버 설정)",
+                required=False,
+                type=openapi.TYPE_BOOLEAN
             )
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
-                description="워크플로우 실행 성공"
+                description="워크플로우 실행 성공",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'history_uuid': openapi.Schema(type=openapi.TYPE_STRING, format='uuid', description='시작된 실행의 History UUID'),
+                    }
+                )
             ),
             status.HTTP_404_NOT_FOUND: openapi.Response(
                 description="지정된 UUID를 가진 워크플로우를 찾을 수 없음"
+            ),
+            status.HTTP_409_CONFLICT: openapi.Response(
+                description="워크플로우의 최대 동시 실행 수에 도달함"
             )
         }
     )
@@ -361,11 +513,18 @@ class WorkflowExecuteAPIView(APIView):
         '''
         입력 받은 Workflow를 수행한다.
         '''
+        prewarm = request.query_params.get('prewarm')
+        if prewarm is not None:
+            prewarm = prewarm.lower() in ('true', '1')
+
         workflow_service = WorkflowService()
-        result = workflow_service.execute_workflow(workflow_uuid)
+        try:
+            history_uuid = workflow_service.execute_workflow(workflow_uuid, prewarm=prewarm)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
 
-        if result:
-            return Response(status=status.HTTP_200_OK)
+        if history_uuid:
+            return Response({'history_uuid': history_uuid}, status=status.HTTP_200_OK)
         else:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -388,6 +547,10 @@ class SchedulingAPIView(APIView):
                                                'minutes': openapi.Schema(type=openapi.TYPE_INTEGER, description='분'),
                                                'seconds': openapi.Schema(type=openapi.TYPE_INTEGER, description='초')
                                            }),
+                'cron': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식 (옵션)'),
+                'timezone': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식을 해석할 시간대 (기본값: UTC)'),
+                'calendar': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING, format='date-time'), description='실행 시각 리스트 (옵션)'),
+                'misfire_policy': openapi.Schema(type=openapi.TYPE_STRING, enum=['coalesce', 'fire_all', 'skip'], description='늦어진 실행 처리 방식 (기본값: coalesce)'),
                 'repeat_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='반복 횟수 (기본값: 0)'),
             },
         ),
@@ -404,13 +567,17 @@ class SchedulingAPIView(APIView):
         scheduled_at = request.data.get('scheduled_at')
         interval = request.data.get('interval')
         repeat_count = request.data.get('repeat_count', 0)
+        cron = request.data.get('cron')
+        timezone_name = request.data.get('timezone')
+        calendar = request.data.get('calendar')
+        misfire_policy = request.data.get('misfire_policy')
 
         if not workflow_uuid:
             return Response({'error': 'workflow_uuid is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
         scheduling_service = SchedulingService()
         try:
-            scheduling = scheduling_service.create_scheduling(workflow_uuid, scheduled_at, interval, repeat_count)
+            scheduling = scheduling_service.create_scheduling(workflow_uuid, scheduled_at, interval, repeat_count, cron, timezone_name, calendar, misfire_policy)
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -439,7 +606,12 @@ class SchedulingAPIView(APIView):
                                     'seconds': openapi.Schema(type=openapi.TYPE_INTEGER, description='초'),
                                 }
                             ),
+                            'cron': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식'),
+                            'timezone': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식을 해석할 시간대'),
+                            'calendar': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING, format='date-time'), description='실행 시각 리스트'),
+                            'misfire_policy': openapi.Schema(type=openapi.TYPE_STRING, enum=['coalesce', 'fire_all', 'skip'], description='늦어진 실행 처리 방식'),
                             'repeat_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='반복 횟수'),
+                            'run_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='실행된 횟수'),
                         }
                     )
                 )
@@ -492,7 +664,12 @@ class SchedulingUUIDAPIView(APIView):
                             'seconds': openapi.Schema(type=openapi.TYPE_INTEGER, description='초')
                         }
                     ),
+                    'cron': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식'),
+                    'timezone': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식을 해석할 시간대'),
+                    'calendar': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING, format='date-time'), description='실행 시각 리스트'),
+                    'misfire_policy': openapi.Schema(type=openapi.TYPE_STRING, enum=['coalesce', 'fire_all', 'skip'], description='늦어진 실행 처리 방식'),
                     'repeat_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='반복 횟수'),
+                    'run_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='실행된 횟수'),
                 }
             )
         ),
@@ -530,6 +707,10 @@ class SchedulingUUIDAPIView(APIView):
                         'seconds': openapi.Schema(type=openapi.TYPE_INTEGER, description='초')
                     }
                 ),
+                'cron': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식'),
+                'timezone': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식을 해석할 시간대'),
+                'calendar': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING, format='date-time'), description='실행 시각 리스트'),
+                'misfire_policy': openapi.Schema(type=openapi.TYPE_STRING, enum=['coalesce', 'fire_all', 'skip'], description='늦어진 실행 처리 방식'),
                 'repeat_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='반복 횟수'),
             },
         ),
@@ -628,7 +809,12 @@ class SchedulingWorkflowAPIView(APIView):
                                     'seconds': openapi.Schema(type=openapi.TYPE_INTEGER, description='초'),
                                 }
                             ),
+                            'cron': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식'),
+                            'timezone': openapi.Schema(type=openapi.TYPE_STRING, description='cron 표현식을 해석할 시간대'),
+                            'calendar': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING, format='date-time'), description='실행 시각 리스트'),
+                            'misfire_policy': openapi.Schema(type=openapi.TYPE_STRING, enum=['coalesce', 'fire_all', 'skip'], description='늦어진 실행 처리 방식'),
                             'repeat_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='반복 횟수'),
+                            'run_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='실행된 횟수'),
                         }
                     )
                 )
@@ -718,3 +904,30 @@ class SchedulingDeactivateAPIView(APIView):
             return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({"message": message}, status=status.HTTP_200_OK)
+
+
+class MetricsAPIView(APIView):
+    '''
+    엔진 동작 지표를 반환하는 API.
+    '''
+    @swagger_auto_schema(
+        operation_summary="엔진 지표 조회",
+        operation_description="Job 실행 요청 수, 완료된 Workflow 실행 수 등 엔진 동작 지표를 반환합니다.",
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="엔진 지표 조회 성공",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
+                )
+            ),
+        }
+    )
+    def get(self, request):
+        '''
+        수집된 엔진 동작 지표를 반환한다.
+        '''
+        metrics_service = MetricsService()
+        metrics = metrics_service.get_metrics()
+
+        return Response(metrics, status=status.HTTP_200_OK)
@@ -12,3 +12,26 @@ HISTORY_STATUS_FAIL = 'fail'
 WORKFLOW_STATUS_RUNNING = 'running'
 WORKFLOW_STATUS_SUCCESS = 'success'
 WORKFLOW_STATUS_FAIL = 'fail'
+
+# 이미지 Pull 정책
+IMAGE_PULL_POLICY_ALWAYS = 'always'
+IMAGE_PULL_POLICY_IF_NOT_PRESENT = 'if-not-present'
+IMAGE_PULL_POLICY_NEVER = 'never'
+
+# 컨테이너 감시 방식
+CONTAINER_SUPERVISION_BLOCKING = 'blocking'
+CONTAINER_SUPERVISION_WATCHER = 'watcher'
+
+# Job 실행 런타임
+JOB_RUNTIME_DOCKER = 'docker'
+JOB_RUNTIME_SUBPROCESS = 'subprocess'
+
+# 스케줄러 동작 방식
+SCHEDULER_MODE_HEAP = 'heap'
+SCHEDULER_MODE_TICK = 'tick'
+
+# 늦어진 Scheduling 실행 처리 방식
+SCHEDULING_MISFIRE_COALESCE = 'coalesce'
+SCHEDULING_MISFIRE_FIRE_ALL = 'fire_all'
+SCHEDULING_MISFIRE_SKIP = 'skip'
+SCHEDULING_MISFIRE_POLICIES = (SCHEDULING_MISFIRE_COALESCE, SCHEDULING_MISFIRE_FIRE_ALL, SCHEDULING_MISFIRE_SKIP)
@@ -1 +1 @@
-from project_apps.engine import job_dependency,job_execute
+from project_apps.engine import image_prewarm,job_attempt_flush,job_execute,scheduling_execute
@@ -0,0 +1,116 @@
+import time
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from requests.exceptions import ReadTimeout
+
+from project_apps.engine.docker_client import get_docker_client
+
+EXEC_POLL_INTERVAL = 0.05
+
+# {image_name: [[container, last_used_at, use_count], ...]}
+_idle_containers = {}
+
+
+def is_pooled_image(image_name):
+    '''
+    웜 풀 모드로 실행하도록 설정된 이미지인지 확인한다.
+    '''
+    return image_name in settings.DOCKER_WARM_POOL_IMAGES
+
+
+def acquire_container(image_name, image):
+    '''
+    웜 풀에서 대기 중인 러너 컨테이너를 꺼내 반환하고, 없다면 새로 생성한다.
+    러너 컨테이너는 이미지의 명령 대신 sleep으로 떠 있으면서 Job 실행 요청을 받는다.
+    '''
+    evict_idle_containers()
+
+    idle_containers = _idle_containers.get(image_name, [])
+    while idle_containers:
+        entry = idle_containers.pop()
+        entry[0].reload()
+        if entry[0].status == 'running':
+            return entry
+        _discard(entry[0])
+
+    container = get_docker_client().containers.run(
+        image,
+        entrypoint=['sleep', 'infinity'],
+        detach=True,
+        labels={'workflow_engine.warm_pool': image_name}
+    )
+    return [container, time.monotonic(), 0]
+
+
+def release_container(image_name, entry):
+    '''
+    사용이 끝난 러너 컨테이너를 웜 풀에 반납한다.
+    풀이 가득 찼거나 최대 사용 횟수에 도달한 컨테이너는 제거한다.
+    '''
+    entry[1] = time.monotonic()
+    entry[2] += 1
+
+    idle_containers = _idle_containers.setdefault(image_name, [])
+    if len(idle_containers) < settings.DOCKER_WARM_POOL_SIZE and entry[2] < settings.DOCKER_WARM_POOL_MAX_USES:
+        idle_containers.append(entry)
+    else:
+        _discard(entry[0])
+
+
+def exec_in_container(entry, image, environment, timeout, command=None):
+    '''
+    러너 컨테이너 안에서 이미지에 정의된 명령을 실행하고 종료 코드를 반환한다.
+    command가 주어지면 이미지의 Cmd 대신 사용한다.
+    timeout 내에 끝나지 않으면 ReadTimeout을 발생시키며, 실행 중 예외가 발생하면 상태를 알 수 없는 컨테이너를 제거하고 예외를 다시 발생시킨다.
+    '''
+    config = image.attrs.get('Config') or {}
+    command = (config.get('Entrypoint') or []) + (command or config.get('Cmd') or [])
+    if not command:
+        raise ValueError(f"Image {image.id} has no command to execute")
+
+    api = get_docker_client().api
+    try:
+        exec_id = api.exec_create(entry[0].id, command, environment=environment)['Id']
+        api.exec_start(exec_id, detach=True)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            result = api.exec_inspect(exec_id)
+            if not result['Running']:
+                return result['ExitCode']
+            if time.monotonic() >= deadline:
+                raise ReadTimeout(f"Job exceeded timeout of {timeout}s in container {entry[0].id}")
+            time.sleep(EXEC_POLL_INTERVAL)
+    except Exception:
+        _discard(entry[0])
+        raise
+
+
+def evict_idle_containers():
+    '''
+    DOCKER_WARM_POOL_IDLE_TTL 이상 사용되지 않은 러너 컨테이너를 제거한다.
+    '''
+    expired_at = time.monotonic() - settings.DOCKER_WARM_POOL_IDLE_TTL
+    for image_name, idle_containers in _idle_containers.items():
+        for entry in [entry for entry in idle_containers if entry[1] < expired_at]:
+            idle_containers.remove(entry)
+            _discard(entry[0])
+
+
+@worker_process_shutdown.connect
+def drain_pool(**kwargs):
+    '''
+    워커 프로세스가 종료될 때 웜 풀의 모든 러너 컨테이너를 제거한다.
+    '''
+    for idle_containers in _idle_containers.values():
+        for entry in idle_containers:
+            _discard(entry[0])
+    _idle_containers.clear()
+
+
+def _discard(container):
+    try:
+        container.remove(force=True)
+    except Exception as e:
+        print(f"Error removing pooled container {container.id}: {e}")
@@ -0,0 +1,117 @@
+import heapq
+import logging
+import threading
+import time
+
+from django.utils.dateparse import parse_datetime
+from docker.errors import NotFound
+
+from project_apps.engine import tasks_manager
+from project_apps.engine.docker_client import get_docker_client
+from project_apps.engine.job_execute import LABEL_ATTEMPT, LABEL_HISTORY_UUID, LABEL_JOB_UUID, LABEL_TIMEOUT, LABEL_WORKFLOW_UUID
+
+TIMEOUT_CHECK_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class ContainerWatcher:
+    '''
+    도커 이벤트를 구독하여 Job 컨테이너의 종료를 감지하고, timeout이 지난 컨테이너를 종료하는 감시 프로세스.
+    컨테이너의 종료 결과는 job_exit task로 워커에 전달하므로, 하나의 프로세스가 많은 컨테이너를 동시에 감시할 수 있다.
+    '''
+    def __init__(self):
+        self.client = get_docker_client()
+        self.deadlines = []
+        # timeout을 감시 중인 실행 중 컨테이너 ID 집합
+        self.running = set()
+        self.lock = threading.Lock()
+
+    def run(self):
+        '''
+        timeout 감시 스레드를 시작하고 컨테이너 이벤트를 처리한다.
+        이벤트 구독을 먼저 시작한 뒤 기존 컨테이너를 복원하여 그 사이의 이벤트를 놓치지 않는다.
+        그 사이에 종료된 컨테이너는 두 번 전달될 수 있지만, job_exit가 컨테이너 별로 한 번만 처리한다.
+        '''
+        threading.Thread(target=self.enforce_timeouts, daemon=True).start()
+
+        events = self.client.events(decode=True, filters={
+            'type': 'container',
+            'event': ['start', 'die'],
+            'label': LABEL_JOB_UUID
+        })
+        self.reconcile()
+
+        for event in events:
+            attributes = event['Actor']['Attributes']
+            if event['Action'] == 'start':
+                self.track(event['Actor']['ID'], attributes, time.time())
+            elif event['Action'] == 'die':
+                self.report_exit(event['Actor']['ID'], attributes, int(attributes.get('exitCode', -1)))
+
+    def reconcile(self):
+        '''
+        감시 프로세스가 시작되기 전부터 실행 중이거나 이미 종료된 Job 컨테이너를 처리한다.
+        '''
+        for container in self.client.containers.list(all=True, filters={'label': LABEL_JOB_UUID}):
+            state = container.attrs['State']
+            if state['Running']:
+                started_at = parse_datetime(state['StartedAt'])
+                self.track(container.id, container.labels, started_at.timestamp() if started_at else time.time())
+            elif state['Status'] in ('exited', 'dead'):
+                self.report_exit(container.id, container.labels, state['ExitCode'])
+
+    def track(self, container_id, labels, started_at):
+        '''
+        컨테이너의 timeout 기한을 등록한다.
+        '''
+        deadline = started_at + int(labels.get(LABEL_TIMEOUT, 0))
+        with self.lock:
+            self.running.add(container_id)
+            heapq.heappush(self.deadlines, (deadline, container_id))
+
+    def report_exit(self, container_id, labels, status_code):
+        '''
+        컨테이너의 timeout 감시를 멈추고 종료 결과를 job_exit task로 전달한다.
+        기한이 남은 항목은 heap에 남지만, 종료된 컨테이너의 항목이 실행 중인 컨테이너 수의 두 배를 넘으면 heap을 다시 만든다.
+        '''
+        with self.lock:
+            self.running.discard(container_id)
+            if len(self.deadlines) > 2 * len(self.running):
+                self.deadlines = [entry for entry in self.deadlines if entry[1] in self.running]
+                heapq.heapify(self.deadlines)
+
+        tasks_manager.job_exit(
+            labels[LABEL_WORKFLOW_UUID],
+            labels[LABEL_HISTORY_UUID],
+            labels[LABEL_JOB_UUID],
+            int(labels.get(LABEL_ATTEMPT, 0)),
+            container_id,
+            status_code
+        )
+
+    def enforce_timeouts(self):
+        '''
+        timeout 기한이 지난 컨테이너를 종료한다. 종료된 컨테이너는 die 이벤트를 통해 실패로 처리된다.
+        이미 종료된 컨테이너의 기한은 건너뛴다.
+        '''
+        while True:
+            now = time.time()
+            expired = []
+            with self.lock:
+                while self.deadlines and self.deadlines[0][0] <= now:
+                    container_id = heapq.heappop(self.deadlines)[1]
+                    if container_id in self.running:
+                        expired.append(container_id)
+
+            for container_id in expired:
+                try:
+                    container = self.client.containers.get(container_id)
+                    if container.status == 'running':
+                        container.kill()
+                except NotFound:
+                    pass
+                except Exception:
+                    logger.exception("Error terminating timed out container %s", container_id)
+
+            time.sleep(TIMEOUT_CHECK_INTERVAL)
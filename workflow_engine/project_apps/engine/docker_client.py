@@ -0,0 +1,61 @@
+import os
+import time
+
+import docker
+from django.conf import settings
+from docker.errors import ImageNotFound
+
+from project_apps.constants import IMAGE_PULL_POLICY_ALWAYS, IMAGE_PULL_POLICY_NEVER
+
+_client = None
+_client_pid = None
+_image_cache = {}
+
+
+def get_docker_client():
+    '''
+    워커 프로세스 별로 하나의 도커 클라이언트를 생성하여 재사용한다.
+    '''
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        _client = docker.from_env()
+        _client_pid = os.getpid()
+        _image_cache.clear()
+    return _client
+
+
+def get_cached_image(image_name):
+    '''
+    워커의 이미지 캐시에 있는 이미지를 반환하고, 없다면 None을 반환한다.
+    '''
+    cached = _image_cache.get(image_name)
+    return cached[0] if cached else None
+
+
+def get_image(image_name):
+    '''
+    Pull 정책에 따라 워커의 이미지 캐시, 로컬 도커 데몬, 레지스트리 순으로 이미지를 찾아 반환한다.
+    태그로 지정된 이미지는 DOCKER_IMAGE_CACHE_TTL 동안, digest로 고정된 이미지는 만료 없이 캐시된다.
+    '''
+    client = get_docker_client()
+
+    cached = _image_cache.get(image_name)
+    if cached and (cached[1] is None or cached[1] > time.monotonic()):
+        return cached[0]
+
+    policy = settings.DOCKER_IMAGE_PULL_POLICY
+    image = None
+    if policy != IMAGE_PULL_POLICY_ALWAYS:
+        try:
+            image = client.images.get(image_name)
+        except ImageNotFound:
+            if policy == IMAGE_PULL_POLICY_NEVER:
+                raise
+
+    if image is None:
+        image = client.images.pull(image_name)
+
+    expires_at = None if '@sha256:' in image_name else time.monotonic() + settings.DOCKER_IMAGE_CACHE_TTL
+    _image_cache[image_name] = (image, expires_at)
+    return image
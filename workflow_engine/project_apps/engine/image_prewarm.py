@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from project_apps.engine.docker_client import get_image
+
+
+@shared_task
+def image_prewarm(image_name):
+    '''
+    Job이 실행되기 전에 도커 이미지를 미리 받아 워커에 캐싱한다.
+    '''
+    try:
+        get_image(image_name)
+
+    except Exception as e:
+        print(f"Error prewarming image {image_name}: {e}")
@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from project_apps.service.job_attempt_service import JobAttemptService
+
+
+@shared_task
+def flush_job_attempts():
+    '''
+    버퍼에 쌓인 Job 시도 기록을 데이터베이스에 묶어서 저장한다.
+    '''
+    JobAttemptService().flush_attempts()
@@ -1,72 +1,258 @@
+import random
+import socket
+import time
+from subprocess import TimeoutExpired
+
 from requests.exceptions import ReadTimeout, ConnectionError
 
-import docker, orjson as json
-from docker.errors import ImageNotFound, APIError
+from docker.errors import ImageNotFound, APIError, NotFound
 from celery import shared_task
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
 
-from project_apps.constants import JOB_STATUS_RUNNING, JOB_STATUS_SUCCESS, JOB_STATUS_FAIL, WORKFLOW_STATUS_FAIL
+from project_apps.constants import CONTAINER_SUPERVISION_WATCHER, JOB_RUNTIME_DOCKER, JOB_STATUS_FAIL, WORKFLOW_STATUS_FAIL
+from project_apps.engine import tasks_manager
+from project_apps.engine.container_pool import is_pooled_image
+from project_apps.engine.docker_client import get_docker_client, get_image
+from project_apps.engine.job_runtime import get_runtime, resource_limits
+from project_apps.service.job_attempt_service import JobAttemptService
 from project_apps.service.workflow_manage import WorkflowManager
 
+# 감시 프로세스가 컨테이너의 Job 정보를 복원할 때 사용하는 라벨
+LABEL_WORKFLOW_UUID = 'workflow_engine.workflow_uuid'
+LABEL_HISTORY_UUID = 'workflow_engine.history_uuid'
+LABEL_JOB_UUID = 'workflow_engine.job_uuid'
+LABEL_ATTEMPT = 'workflow_engine.attempt'
+LABEL_TIMEOUT = 'workflow_engine.timeout'
+LABEL_RESOURCE_POOL = 'workflow_engine.resource_pool'
+LABEL_QUEUED_AT = 'workflow_engine.queued_at'
+LABEL_WORKER = 'workflow_engine.worker'
+
+# Job 시도 기록에 남기는 워커 이름
+WORKER_NAME = socket.gethostname()
+
 
 @shared_task
-def job_trial(workflow_uuid, history_uuid, job_uuid):
+def job_trial(workflow_uuid, history_uuid, job_uuid, attempt=0, queued_at=None):
     '''
-    최대 지정된 retries 수만큼 job을 수행 시도하고, 결과에 따라 처리한다.
+    job을 한 번 수행 시도하고, 실패했다면 재시도를 별도의 task로 예약한다.
+    워커의 자원 풀에 Job이 선언한 자원이 남아 있지 않다면 시도 횟수를 소모하지 않고 잠시 뒤로 미룬다.
+    감시 프로세스 모드에서는 컨테이너를 실행만 하고 종료 처리와 자원 반납은 job_exit에 맡긴다.
+    queued_at은 시도가 수행 가능해진 시각(epoch 초)으로, 자원 부족으로 미뤄진 시간도 대기 시간에 포함되도록 그대로 전달한다.
     '''
     workflow_manager = WorkflowManager()
 
-    job_data = workflow_manager.find_job_data(workflow_uuid, job_uuid)
+    job_data = workflow_manager.find_job_data(history_uuid, job_uuid)
     if not job_data:
         return
-    
-    retries = job_data['retries']
-    for _ in range(retries+1):
-        result = job_execute(workflow_uuid, history_uuid, job_uuid)
-        if result is not None:
-            return
-    
-    workflow_manager.update_job_status(workflow_uuid, job_uuid, JOB_STATUS_FAIL)
-    workflow_manager.handle_failure(workflow_uuid, history_uuid)
-    
-def job_execute(workflow_uuid, history_uuid, job_uuid):
+
+    if not workflow_manager.reserve_resources(job_data, history_uuid, attempt):
+        tasks_manager.job_execute(
+            workflow_uuid, history_uuid, job_uuid, attempt,
+            countdown=settings.JOB_ADMISSION_RETRY_DELAY * random.uniform(1, 2), priority=job_data.get('priority'), queued_at=queued_at
+        )
+        return
+
+    if is_supervised(job_data):
+        result = job_launch(workflow_uuid, history_uuid, job_uuid, attempt, queued_at)
+        if not result:
+            workflow_manager.release_resources(history_uuid, job_uuid, attempt)
+    else:
+        result = job_execute(workflow_uuid, history_uuid, job_uuid, attempt, queued_at)
+        workflow_manager.release_resources(history_uuid, job_uuid, attempt)
+
+    if result is None:
+        handle_attempt_failure(workflow_manager, job_data, workflow_uuid, history_uuid, attempt)
+
+
+@shared_task
+def job_exit(workflow_uuid, history_uuid, job_uuid, attempt, container_id, status_code):
     '''
-    입력 받은 Job을 제한된 timeout 내에 수행하고, 결과에 따라 처리한다.
+    감시 프로세스가 전달한 컨테이너 종료 결과를 처리하고, 컨테이너 정보로 Job 시도 기록을 남긴다.
+    같은 컨테이너의 종료 결과는 먼저 선점한 한 번만 처리한다.
     '''
-    client = docker.from_env()
+    client = get_docker_client()
     workflow_manager = WorkflowManager()
 
-    if workflow_manager.check_workflow_status(workflow_uuid) == WORKFLOW_STATUS_FAIL:
-        return False
+    try:
+        container = client.containers.get(container_id)
+    except NotFound:
+        # 이미 처리되어 제거된 컨테이너
+        return
+
+    if not workflow_manager.claim_container_exit(container_id):
+        return
+
+    try:
+        workflow_manager.remove_container_from_running_list(history_uuid, container_id)
+        container.remove(force=True)
+    except Exception:
+        # 컨테이너가 남아 있으므로 다시 전달된 종료 결과가 처리할 수 있도록 선점을 풀어준다.
+        workflow_manager.release_container_exit(container_id)
+        raise
+    if LABEL_RESOURCE_POOL in container.labels:
+        workflow_manager.release_resources(history_uuid, job_uuid, attempt, container.labels[LABEL_RESOURCE_POOL])
+
+    state = container.attrs.get('State') or {}
+    started_at, finished_at = parse_datetime(state.get('StartedAt') or ''), parse_datetime(state.get('FinishedAt') or '')
+    JobAttemptService().record_attempt(
+        workflow_uuid, history_uuid, job_uuid, attempt,
+        (container.attrs.get('Config') or {}).get('Image', ''),
+        float(container.labels[LABEL_QUEUED_AT]) if LABEL_QUEUED_AT in container.labels else None,
+        started_at.timestamp() if started_at else None,
+        finished_at.timestamp() if finished_at else time.time(),
+        status_code, container.attrs.get('Image', ''), container.labels.get(LABEL_WORKER, '')
+    )
+
+    job_data = workflow_manager.find_job_data(history_uuid, job_uuid)
+    if not job_data or workflow_manager.check_workflow_status(history_uuid) == WORKFLOW_STATUS_FAIL:
+        return
+
+    if status_code == 0:
+        if started_at and finished_at:
+            workflow_manager.record_job_duration(job_uuid, (finished_at - started_at).total_seconds())
+        workflow_manager.handle_success(job_data, workflow_uuid, history_uuid)
+    else:
+        handle_attempt_failure(workflow_manager, job_data, workflow_uuid, history_uuid, attempt)
+
+
+def is_supervised(job_data):
+    '''
+    Job을 감시 프로세스 모드로 수행할지 확인한다. 도커 런타임이 아니거나 웜 풀 이미지인 Job은 항상 직접 수행한다.
+    '''
+    return (
+        settings.CONTAINER_SUPERVISION_MODE == CONTAINER_SUPERVISION_WATCHER
+        and (job_data.get('runtime') or JOB_RUNTIME_DOCKER) == JOB_RUNTIME_DOCKER
+        and not is_pooled_image(job_data['image'])
+    )
+
+
+def handle_attempt_failure(workflow_manager, job_data, workflow_uuid, history_uuid, attempt):
+    '''
+    실패한 시도를 처리한다. 재시도 횟수가 남았다면 backoff 시간 뒤에 다음 시도를 예약하고,
+    그렇지 않다면 Job과 Workflow를 실패 처리한다.
+    '''
+    if attempt < job_data['retries']:
+        tasks_manager.job_execute(
+            workflow_uuid, history_uuid, job_data['uuid'], attempt+1,
+            countdown=retry_countdown(job_data, attempt), priority=job_data.get('priority')
+        )
+        return
+
+    workflow_manager.update_job_status(history_uuid, job_data['uuid'], JOB_STATUS_FAIL)
+    workflow_manager.handle_failure(workflow_uuid, history_uuid)
+
+
+def retry_countdown(job_data, attempt):
+    '''
+    attempt번째 시도가 실패한 뒤 다음 시도까지 대기할 시간(초)을 반환한다.
+    retry_delay * retry_backoff^attempt를 retry_jitter 비율만큼 무작위로 흔들고, JOB_RETRY_MAX_DELAY로 제한한다.
+    '''
+    delay = job_data.get('retry_delay', 1) * job_data.get('retry_backoff', 2.0) ** attempt
+    jitter = job_data.get('retry_jitter', 0.1)
+    delay *= 1 + random.uniform(-jitter, jitter)
+    return min(max(delay, 0), settings.JOB_RETRY_MAX_DELAY)
+
 
-    job_data = workflow_manager.find_job_data(workflow_uuid, job_uuid)
+def prepare_job(workflow_manager, history_uuid, job_uuid):
+    '''
+    Job을 실행 상태로 바꾸고 실행에 필요한 (Job 정보, 환경변수, timeout)을 반환한다.
+    실행할 수 없는 경우 None을 반환한다.
+    '''
+    job_data = workflow_manager.start_job(history_uuid, job_uuid)
     if not job_data:
-        return False
+        return None
+
+    environment = job_data.get('parameters') or {}
+    timeout = job_data['timeout']
+    if not timeout:
+        timeout = 10
+
+    return job_data, environment, timeout
+
+
+def job_launch(workflow_uuid, history_uuid, job_uuid, attempt, queued_at=None):
+    '''
+    입력 받은 Job의 컨테이너를 실행만 하고 곧바로 반환한다.
+    컨테이너 종료와 timeout은 감시 프로세스가 처리하며, 컨테이너를 실행하지 못했다면 실패한 시도로 기록한다.
+    '''
+    client = get_docker_client()
+    workflow_manager = WorkflowManager()
 
     try:
-        if not workflow_manager.update_job_status(workflow_uuid, job_uuid, JOB_STATUS_RUNNING):
+        prepared = prepare_job(workflow_manager, history_uuid, job_uuid)
+        if prepared is None:
             return False
-        image = client.images.pull(job_data['image'])
-        parameters = job_data.get('parameters', '{}')
-        environment = json.loads(parameters.replace("'", "\""))
-        timeout = job_data['timeout']
-        if not timeout:
-            timeout = 10
-        
-        container = client.containers.run(image, detach=True, environment=environment)
-        workflow_manager.add_container_to_running_list(workflow_uuid, container.id)
-        result = container.wait(timeout=timeout)
-
-        if result['StatusCode'] == 0:
-            if not workflow_manager.update_job_status(workflow_uuid, job_uuid, JOB_STATUS_SUCCESS):
+        job_data, environment, timeout = prepared
+
+        labels = {
+            LABEL_WORKFLOW_UUID: str(workflow_uuid),
+            LABEL_HISTORY_UUID: str(history_uuid),
+            LABEL_JOB_UUID: str(job_uuid),
+            LABEL_ATTEMPT: str(attempt),
+            LABEL_TIMEOUT: str(timeout),
+            LABEL_WORKER: WORKER_NAME
+        }
+        if queued_at is not None:
+            labels[LABEL_QUEUED_AT] = str(queued_at)
+        limits = resource_limits(job_data)
+        if limits:
+            labels[LABEL_RESOURCE_POOL] = settings.WORKER_RESOURCE_POOL
+
+        try:
+            container = client.containers.run(
+                get_image(job_data['image']), command=job_data.get('command') or None,
+                detach=True, environment=environment, labels=labels, **limits
+            )
+        except Exception as e:
+            JobAttemptService().record_attempt(
+                workflow_uuid, history_uuid, job_uuid, attempt, job_data['image'], queued_at, None, time.time(), None,
+                worker=WORKER_NAME, error=type(e).__name__
+            )
+            raise
+        workflow_manager.add_container_to_running_list(history_uuid, container.id)
+        return True
+
+    except Exception as e:
+        return None
+
+
+def job_execute(workflow_uuid, history_uuid, job_uuid, attempt=0, queued_at=None):
+    '''
+    입력 받은 Job을 Job에 지정된 런타임으로 제한된 timeout 내에 수행하고, 시도 기록을 남긴 뒤 결과에 따라 처리한다.
+    '''
+    workflow_manager = WorkflowManager()
+
+    try:
+        prepared = prepare_job(workflow_manager, history_uuid, job_uuid)
+        if prepared is None:
+            return False
+        job_data, environment, timeout = prepared
+
+        runtime = get_runtime(job_data)
+        started_at = time.time()
+        status_code, error = None, ''
+        try:
+            status_code = runtime.execute(workflow_manager, job_data, history_uuid, environment, timeout)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            finished_at = time.time()
+            JobAttemptService().record_attempt(
+                workflow_uuid, history_uuid, job_uuid, attempt, job_data.get('image'), queued_at, started_at, finished_at,
+                status_code, runtime.image_digest(job_data), WORKER_NAME, error
+            )
+
+        if status_code == 0:
+            workflow_manager.record_job_duration(job_uuid, finished_at - started_at)
+            if not workflow_manager.handle_success(job_data, workflow_uuid, history_uuid):
                 return False
-            workflow_manager.handle_success(job_data, workflow_uuid, history_uuid)
-            workflow_manager.remove_container_from_running_list(workflow_uuid, container.id)
-            container.remove()
             return True
         else:
             return None
 
-    except (ReadTimeout, ConnectionError, ImageNotFound, APIError) as e:
+    except (ReadTimeout, ConnectionError, ImageNotFound, APIError, TimeoutExpired) as e:
         return None
 
     except Exception as e:
@@ -0,0 +1,152 @@
+import os
+import signal
+import subprocess
+import time
+
+from django.conf import settings
+
+from project_apps.constants import JOB_RUNTIME_DOCKER, JOB_RUNTIME_SUBPROCESS, WORKFLOW_STATUS_FAIL
+from project_apps.engine.container_pool import acquire_container, exec_in_container, is_pooled_image, release_container
+from project_apps.engine.docker_client import get_cached_image, get_docker_client, get_image
+
+SUBPROCESS_POLL_INTERVAL = 0.05
+# 프로세스 실행 중 Workflow 실패 여부를 확인하는 간격(초)
+SUBPROCESS_CANCEL_CHECK_INTERVAL = 1.0
+
+
+def resource_limits(job_data):
+    '''
+    Job이 선언한 CPU(코어)와 메모리(MB)를 도커 컨테이너의 자원 제한 인자로 변환한다.
+    '''
+    limits = {}
+    if job_data.get('cpu'):
+        limits['nano_cpus'] = int(job_data['cpu'] * 1e9)
+    if job_data.get('memory'):
+        limits['mem_limit'] = f"{job_data['memory']}m"
+    return limits
+
+
+class DockerRuntime:
+    '''
+    Job을 도커 컨테이너로 실행하는 런타임. 웜 풀 이미지는 러너 컨테이너에서 실행한다.
+    러너 컨테이너는 여러 Job이 공유하므로 Job 별 자원 제한은 새로 생성하는 컨테이너에만 적용한다.
+    '''
+    def execute(self, workflow_manager, job_data, history_uuid, environment, timeout):
+        '''
+        Job을 실행하고 종료 코드를 반환한다. 성공한 컨테이너는 곧바로 제거한다.
+        '''
+        image = get_image(job_data['image'])
+        command = job_data.get('command') or None
+        if is_pooled_image(job_data['image']):
+            return self.execute_pooled(workflow_manager, job_data, history_uuid, image, environment, timeout, command)
+
+        container = get_docker_client().containers.run(image, command=command, detach=True, environment=environment, **resource_limits(job_data))
+        workflow_manager.add_container_to_running_list(history_uuid, container.id)
+        result = container.wait(timeout=timeout)
+
+        if result['StatusCode'] == 0:
+            workflow_manager.remove_container_from_running_list(history_uuid, container.id)
+            container.remove()
+        return result['StatusCode']
+
+    def execute_pooled(self, workflow_manager, job_data, history_uuid, image, environment, timeout, command):
+        '''
+        웜 풀의 러너 컨테이너에서 Job을 실행하고 종료 코드를 반환한다.
+        러너 컨테이너는 실행이 정상적으로 끝난 경우에만 웜 풀에 반납한다.
+        '''
+        entry = acquire_container(job_data['image'], image)
+        container_id = entry[0].id
+        workflow_manager.add_container_to_running_list(history_uuid, container_id)
+        try:
+            status_code = exec_in_container(entry, image, environment, timeout, command)
+        finally:
+            workflow_manager.remove_container_from_running_list(history_uuid, container_id)
+        release_container(job_data['image'], entry)
+        return status_code
+
+    def image_digest(self, job_data):
+        '''
+        Job을 실행한 이미지의 ID(sha256 digest)를 워커의 이미지 캐시에서 찾아 반환한다. 찾을 수 없다면 빈 문자열을 반환한다.
+        '''
+        return getattr(get_cached_image(job_data['image']), 'id', '')
+
+
+class SubprocessRuntime:
+    '''
+    신뢰할 수 있는 Job의 command를 워커 호스트의 프로세스로 직접 실행하는 런타임.
+    컨테이너 생성 비용이 없으므로 많은 수의 작은 Job을 실행하거나 도커 데몬 없이 엔진을 확인할 때 사용한다.
+    파라미터는 워커의 환경변수에 더해 전달된다.
+    '''
+    def execute(self, workflow_manager, job_data, history_uuid, environment, timeout):
+        '''
+        Job을 실행하고 종료 코드를 반환한다. timeout이 지나면 프로세스 그룹을 종료하고 TimeoutExpired를 발생시키며,
+        실행 중 Workflow가 실패하면 프로세스 그룹을 종료한다.
+        '''
+        command = job_data.get('command')
+        if not command:
+            raise ValueError(f"Job {job_data['uuid']} has no command to execute")
+
+        process = subprocess.Popen(
+            command,
+            env={**os.environ, **{key: str(value) for key, value in environment.items()}},
+            start_new_session=True
+        )
+
+        deadline = time.monotonic() + timeout
+        next_check_at = time.monotonic() + SUBPROCESS_CANCEL_CHECK_INTERVAL
+        while True:
+            try:
+                return process.wait(timeout=SUBPROCESS_POLL_INTERVAL)
+            except subprocess.TimeoutExpired:
+                pass
+
+            now = time.monotonic()
+            if now >= deadline:
+                self.kill(process)
+                raise subprocess.TimeoutExpired(command, timeout)
+            if now >= next_check_at:
+                next_check_at = now + SUBPROCESS_CANCEL_CHECK_INTERVAL
+                if workflow_manager.check_workflow_status(history_uuid) == WORKFLOW_STATUS_FAIL:
+                    self.kill(process)
+                    return process.returncode
+
+    def image_digest(self, job_data):
+        '''
+        프로세스로 실행한 Job은 이미지가 없으므로 빈 문자열을 반환한다.
+        '''
+        return ''
+
+    def kill(self, process):
+        '''
+        Job 프로세스와 그 자식 프로세스들을 종료한다.
+        '''
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+
+RUNTIMES = {
+    JOB_RUNTIME_DOCKER: DockerRuntime(),
+    JOB_RUNTIME_SUBPROCESS: SubprocessRuntime(),
+}
+
+
+def validate_runtime(runtime):
+    '''
+    지원하며 JOB_RUNTIMES_ENABLED 설정으로 허용된 런타임인지 확인한다.
+    '''
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown job runtime '{runtime}'")
+    if runtime not in settings.JOB_RUNTIMES_ENABLED:
+        raise ValueError(f"Job runtime '{runtime}' is not enabled")
+
+
+def get_runtime(job_data):
+    '''
+    Job에 지정된 런타임을 반환한다.
+    '''
+    runtime = job_data.get('runtime') or JOB_RUNTIME_DOCKER
+    validate_runtime(runtime)
+    return RUNTIMES[runtime]
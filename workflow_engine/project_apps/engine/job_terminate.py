@@ -1,13 +1,14 @@
-import docker
 from celery import shared_task
 
+from project_apps.engine.docker_client import get_docker_client
+
 
 @shared_task
 def job_terminate(container_id):
     '''
     입력받은 도커 컨테이너를 종료한다.
     '''
-    client = docker.from_env()
+    client = get_docker_client()
     try:
         container = client.containers.get(container_id)
         if container.status == 'running':
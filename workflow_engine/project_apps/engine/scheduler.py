@@ -0,0 +1,141 @@
+import heapq
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from project_apps.service.scheduling_service import SchedulingService
+
+# 다른 프로세스의 커밋 지연과 시계 차이를 고려하여 이미 읽은 구간의 변경 사항을 다시 읽는 시간(초)
+SYNC_OVERLAP = 5
+
+
+class Scheduler:
+    '''
+    활성화된 Scheduling을 다음 실행 시각 순서의 힙으로 메모리에 유지하고, 실행 시각이 된 Scheduling들을 모아서 실행하는 스케줄러 프로세스.
+    다음 실행 시각은 데이터베이스의 next_run_at에 저장되므로 브로커에 지연 메시지를 남기지 않으며, 재시작되어도 일정을 잃지 않는다.
+    '''
+    def __init__(self):
+        self.scheduling_service = SchedulingService()
+        self.heap = []
+        self.next_runs = {}
+        self.synced_at = None
+
+    def run(self):
+        '''
+        활성화된 Scheduling을 모두 읽은 뒤, 변경 사항 반영과 실행을 반복한다.
+        '''
+        self.load()
+        while True:
+            close_old_connections()
+            self.sync()
+            while self.fire_due():
+                pass
+            self.wait()
+
+    def load(self):
+        '''
+        활성화된 모든 Scheduling의 다음 실행 시각으로 힙을 만든다.
+        '''
+        self.synced_at = timezone.now()
+        for scheduling_uuid, next_run_at in self.scheduling_service.get_active_next_runs():
+            self.next_runs[scheduling_uuid] = next_run_at.timestamp()
+        self.heap = [(timestamp, scheduling_uuid) for scheduling_uuid, timestamp in self.next_runs.items()]
+        heapq.heapify(self.heap)
+
+    def sync(self):
+        '''
+        마지막으로 읽은 이후 생성, 수정, 활성화 또는 비활성화된 Scheduling을 힙에 반영한다.
+        '''
+        now = timezone.now()
+        for scheduling_uuid, is_active, next_run_at in self.scheduling_service.get_changed_next_runs(self.synced_at - timedelta(seconds=SYNC_OVERLAP)):
+            self.track(scheduling_uuid, next_run_at if is_active else None)
+        self.synced_at = now
+
+    def track(self, scheduling_uuid, next_run_at):
+        '''
+        Scheduling의 다음 실행 시각을 등록한다. 바뀌기 전의 힙 항목은 꺼낼 때 무시된다.
+        '''
+        if next_run_at is None:
+            self.next_runs.pop(scheduling_uuid, None)
+            return
+
+        timestamp = next_run_at.timestamp()
+        if self.next_runs.get(scheduling_uuid) != timestamp:
+            self.next_runs[scheduling_uuid] = timestamp
+            heapq.heappush(self.heap, (timestamp, scheduling_uuid))
+
+    def fire_due(self):
+        '''
+        실행 시각이 된 Scheduling을 최대 SCHEDULER_BATCH_SIZE개 모아 한 번에 실행하고, 실행한 수를 반환한다.
+        처리되지 않은 Scheduling은 현재 상태를 다시 읽어, 비활성화되었거나 삭제된 경우에만 힙에서 제외한다.
+        '''
+        now = time.time()
+        due = []
+        while self.heap and self.heap[0][0] <= now and len(due) < settings.SCHEDULER_BATCH_SIZE:
+            timestamp, scheduling_uuid = heapq.heappop(self.heap)
+            if self.next_runs.get(scheduling_uuid) == timestamp:
+                due.append(scheduling_uuid)
+        if not due:
+            return 0
+
+        fired_at = timezone.now()
+        next_runs, deferred = self.scheduling_service.fire_schedulings(due, fired_at)
+        retry_at = time.time() + settings.SCHEDULER_SYNC_INTERVAL
+        for scheduling_uuid in due:
+            self.next_runs.pop(scheduling_uuid, None)
+            if scheduling_uuid in next_runs:
+                self.track(scheduling_uuid, next_runs[scheduling_uuid])
+            elif scheduling_uuid in deferred:
+                # 따라잡기 속도 제한으로 미룬 Scheduling은 다음 실행 시각이 그대로이므로 잠시 뒤에 다시 시도한다.
+                self.retry(scheduling_uuid, retry_at)
+
+        # 다른 스케줄러가 잠갔거나 이미 실행하여 처리되지 않은 Scheduling
+        missed = [scheduling_uuid for scheduling_uuid in due if scheduling_uuid not in next_runs and scheduling_uuid not in deferred]
+        if missed:
+            for scheduling_uuid, is_active, next_run_at in self.scheduling_service.get_next_run_list(missed):
+                if not is_active or next_run_at is None:
+                    continue
+                if next_run_at > fired_at:
+                    self.track(scheduling_uuid, next_run_at)
+                else:
+                    self.retry(scheduling_uuid, retry_at)
+        return len(due)
+
+    def retry(self, scheduling_uuid, retry_at):
+        '''
+        실행 시각이 지났지만 실행하지 못한 Scheduling을 retry_at에 다시 시도하도록 등록한다.
+        '''
+        self.next_runs[scheduling_uuid] = retry_at
+        heapq.heappush(self.heap, (retry_at, scheduling_uuid))
+
+    def wait(self):
+        '''
+        다음 실행 시각 또는 다음 변경 사항 확인 시각 중 이른 시각까지 대기한다.
+        '''
+        timeout = settings.SCHEDULER_SYNC_INTERVAL
+        if self.heap:
+            timeout = min(timeout, max(self.heap[0][0] - time.time(), 0))
+        time.sleep(timeout)
+
+
+class TickScheduler:
+    '''
+    SCHEDULER_TICK_INTERVAL마다 실행 시각이 된 Scheduling을 데이터베이스에서 직접 잠가서 실행하는 스케줄러 프로세스.
+    메모리에 상태를 두지 않고 잠긴 행을 건너뛰므로 여러 프로세스를 함께 실행할 수 있다.
+    '''
+    def __init__(self):
+        self.scheduling_service = SchedulingService()
+
+    def run(self):
+        '''
+        실행 시각이 된 Scheduling이 남지 않을 때까지 묶어서 실행한 뒤 다음 tick까지 대기하기를 반복한다.
+        '''
+        while True:
+            close_old_connections()
+            started_at = time.monotonic()
+            while self.scheduling_service.fire_due_schedulings(timezone.now(), settings.SCHEDULER_BATCH_SIZE) == settings.SCHEDULER_BATCH_SIZE:
+                pass
+            time.sleep(max(settings.SCHEDULER_TICK_INTERVAL - (time.monotonic() - started_at), 0))
@@ -1,15 +1,48 @@
+import time
+
 from celery import current_app
 
 
-def job_execute(workflow_uuid, history_uuid, job_uuid):
+def job_execute(workflow_uuid, history_uuid, job_uuid, attempt=0, countdown=None, priority=None, queued_at=None):
+    '''
+    job을 실제 수행하는 celery task. countdown(초)이 주어지면 그만큼 지난 뒤 수행되고,
+    priority가 주어지면 값이 작을수록 먼저 수행된다.
+    queued_at(epoch 초)이 주어지지 않으면 task가 수행 가능해지는 시각을 Job 시도의 대기 시작 시각으로 전달한다.
+    '''
+    if queued_at is None:
+        queued_at = time.time() + (countdown or 0)
+    current_app.send_task(
+        'project_apps.engine.job_execute.job_trial',
+        args=[workflow_uuid, history_uuid, job_uuid, attempt, queued_at], countdown=countdown, priority=priority
+    )
+
+
+def job_exit(workflow_uuid, history_uuid, job_uuid, attempt, container_id, status_code):
+    '''
+    종료된 job 컨테이너를 처리하는 celery task
+    '''
+    current_app.send_task('project_apps.engine.job_execute.job_exit', args=[workflow_uuid, history_uuid, job_uuid, attempt, container_id, status_code])
+
+
+def image_prewarm(image_name):
+    '''
+    도커 이미지를 미리 받아두는 celery task
+    '''
+    current_app.send_task('project_apps.engine.image_prewarm.image_prewarm', args=[image_name])
+
+
+def scheduled_workflows_execute(fired):
     '''
-    job을 실제 수행하는 celery task
+    실행 시각이 된 Scheduling들의 Workflow를 실행하는 celery task
     '''
-    current_app.send_task('project_apps.engine.job_execute.job_trial', args=[workflow_uuid, history_uuid, job_uuid])
+    current_app.send_task(
+        'project_apps.engine.scheduling_execute.execute_scheduled_workflows',
+        args=[[[str(scheduling_uuid), str(workflow_uuid)] for scheduling_uuid, workflow_uuid in fired]]
+    )
 
 
-def job_dependency(workflow_uuid, history_uuid):
+def job_attempts_flush(countdown=None):
     '''
-    job 의존성 관련 celery task
+    버퍼에 쌓인 Job 시도 기록을 데이터베이스에 저장하는 celery task
     '''
-    current_app.send_task('project_apps.engine.job_dependency.job_dependency', args=[workflow_uuid, history_uuid])
+    current_app.send_task('project_apps.engine.job_attempt_flush.flush_job_attempts', countdown=countdown)
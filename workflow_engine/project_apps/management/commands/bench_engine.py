@@ -0,0 +1,281 @@
+import heapq
+import importlib
+import itertools
+import math
+import os
+import random
+import time
+
+import redis
+from celery import current_app
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from project_apps.engine import docker_client
+from project_apps.models import History
+from project_apps.service.job_attempt_service import JobAttemptService
+from project_apps.service.workflow_service import WorkflowService
+
+SHAPES = ('chain', 'fanout', 'diamond', 'random')
+# 워커 슬롯을 차지하는 Job task로 시뮬레이션하는 task. 나머지 task는 요청되어도 수행하지 않는다.
+SIMULATED_TASKS = (
+    'project_apps.engine.job_execute.job_trial',
+    'project_apps.engine.job_terminate.job_terminate',
+)
+
+
+class FakeImages:
+    def get(self, image_name):
+        return image_name
+
+    def pull(self, image_name, **kwargs):
+        return image_name
+
+
+class FakeContainer:
+    ids = itertools.count()
+
+    def __init__(self, bench):
+        self.bench = bench
+        self.id = f"bench-{next(self.ids)}"
+        self.status = 'running'
+
+    def wait(self, timeout=None):
+        self.bench.container_exited_at = time.perf_counter()
+        return {'StatusCode': 0}
+
+    def remove(self, **kwargs):
+        pass
+
+    def kill(self):
+        pass
+
+
+class FakeContainers:
+    def __init__(self, bench):
+        self.bench = bench
+
+    def run(self, image, **kwargs):
+        return FakeContainer(self.bench)
+
+    def get(self, container_id):
+        return FakeContainer(self.bench)
+
+
+class FakeDockerClient:
+    '''
+    컨테이너를 실제로 실행하지 않고 곧바로 성공으로 종료시키는 도커 클라이언트.
+    '''
+    def __init__(self, bench):
+        self.images = FakeImages()
+        self.containers = FakeContainers(bench)
+
+
+class EngineBench:
+    '''
+    Celery 워커 대신 프로세스 내부 큐로 task를 수행하면서 엔진 오버헤드를 측정한다.
+    Job 실행 시간은 가상 시간으로만 더하고, 워커 수만큼의 병렬 실행을 가상 시계로 시뮬레이션한다.
+    '''
+    def __init__(self, workers, job_duration):
+        self.workers = workers
+        self.job_duration = job_duration
+        self.queue = []
+        self.sequence = itertools.count()
+        self.pending = []
+        self.dispatch_latencies = []
+        self.container_exited_at = None
+        self.redis_commands = 0
+        self.redis_round_trips = 0
+
+    def send_task(self, name, args=None, kwargs=None, **options):
+        if name not in SIMULATED_TASKS:
+            return
+        if self.container_exited_at is not None:
+            self.dispatch_latencies.append(time.perf_counter() - self.container_exited_at)
+        self.pending.append((options.get('priority') or 0, name, args or [], kwargs or {}))
+
+    def flush_pending(self, ready_at):
+        for priority, name, args, kwargs in self.pending:
+            heapq.heappush(self.queue, (ready_at, priority, next(self.sequence), name, args, kwargs))
+        self.pending = []
+
+    def drain(self, started_at):
+        '''
+        큐가 빌 때까지 task를 수행하고, (task 수, 실제 소요 시간, 가상 makespan)을 반환한다.
+        워커가 비면 그 시점까지 준비된 task 중 우선순위가 가장 높은 task를 수행한다.
+        '''
+        free_at = [started_at] * self.workers
+        ready = []
+        makespan = started_at
+        task_count = 0
+        elapsed = 0
+        while self.queue or ready:
+            worker_free_at = heapq.heappop(free_at)
+            if not ready:
+                worker_free_at = max(worker_free_at, self.queue[0][0])
+            while self.queue and self.queue[0][0] <= worker_free_at:
+                ready_at, priority, sequence, name, args, kwargs = heapq.heappop(self.queue)
+                heapq.heappush(ready, (priority, sequence, name, args, kwargs))
+            _, _, name, args, kwargs = heapq.heappop(ready)
+            module_name, task_name = name.rsplit('.', 1)
+            task = getattr(importlib.import_module(module_name), task_name)
+
+            self.container_exited_at = None
+            task_started_at = time.perf_counter()
+            task.apply(args=args, kwargs=kwargs)
+            overhead = time.perf_counter() - task_started_at
+            elapsed += overhead
+            task_count += 1
+
+            finished_at = worker_free_at + self.job_duration + overhead
+            heapq.heappush(free_at, finished_at)
+            makespan = max(makespan, finished_at)
+            self.flush_pending(finished_at)
+
+        return task_count, elapsed, makespan
+
+    def count_redis(self):
+        '''
+        Redis 명령 수와 왕복 횟수를 세도록 redis 클라이언트를 감싸고, 원래대로 되돌리는 함수를 반환한다.
+        '''
+        execute_command = redis.Redis.execute_command
+        pipeline_execute = redis.client.Pipeline.execute
+        bench = self
+
+        def counted_execute_command(client, *args, **options):
+            bench.redis_commands += 1
+            bench.redis_round_trips += 1
+            return execute_command(client, *args, **options)
+
+        def counted_pipeline_execute(pipeline, *args, **options):
+            bench.redis_commands += len(pipeline.command_stack)
+            bench.redis_round_trips += 1
+            return pipeline_execute(pipeline, *args, **options)
+
+        redis.Redis.execute_command = counted_execute_command
+        redis.client.Pipeline.execute = counted_pipeline_execute
+
+        def restore():
+            redis.Redis.execute_command = execute_command
+            redis.client.Pipeline.execute = pipeline_execute
+        return restore
+
+
+def build_jobs(shape, size, seed):
+    '''
+    주어진 모양과 크기의 DAG를 Job 데이터 리스트로 생성한다. Job 인덱스 순서는 위상 정렬 순서를 따른다.
+    '''
+    successors = [[] for _ in range(size)]
+    if shape == 'chain':
+        for index in range(size-1):
+            successors[index].append(index+1)
+    elif shape == 'fanout':
+        successors[0] = list(range(1, size))
+    elif shape == 'diamond':
+        width = max(1, int(math.sqrt(size)))
+        for index in range(size):
+            for offset in (0, 1):
+                next_index = (index // width + 1) * width + (index % width + offset) % width
+                if next_index < size and next_index not in successors[index]:
+                    successors[index].append(next_index)
+    elif shape == 'random':
+        rng = random.Random(seed)
+        for index in range(1, size):
+            for previous_index in rng.sample(range(index), min(index, rng.randint(1, 3))):
+                successors[previous_index].append(index)
+
+    jobs_data = [
+        {
+            'name': f'job-{index}',
+            'image': 'bench',
+            'next_job_names': [f'job-{next_index}' for next_index in successors[index]]
+        }
+        for index in range(size)
+    ]
+    return jobs_data, successors
+
+
+def critical_path_length(successors):
+    '''
+    DAG에서 가장 긴 경로의 Job 수를 반환한다.
+    '''
+    depth = [1] * len(successors)
+    for index in range(len(successors)):
+        for next_index in successors[index]:
+            depth[next_index] = max(depth[next_index], depth[index] + 1)
+    return max(depth) if depth else 0
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values)-1, int(len(values) * ratio))]
+
+
+class Command(BaseCommand):
+    help = (
+        '가짜 도커 클라이언트와 프로세스 내부 task 큐로 합성 DAG를 실행하여 엔진의 처리량, 디스패치 지연, '
+        '임계 경로 및 하한 대비 makespan, Job 당 Redis 명령 수를 측정한다. 측정에 사용한 Workflow는 삭제한다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shapes', nargs='+', choices=SHAPES, default=list(SHAPES))
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--workers', type=int, default=8, help='시뮬레이션할 워커 수')
+        parser.add_argument('--job-duration', type=float, default=1.0, help='Job 하나의 가상 실행 시간(초)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'shape':>8} {'jobs':>6} {'depth':>6} {'jobs/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} "
+            f"{'makespan':>9} {'critical':>9} {'bound':>9} {'ratio':>6} {'cmds/job':>9} {'rtt/job':>8} {'status':>8}"
+        )
+        for shape in options['shapes']:
+            for size in options['sizes']:
+                self.stdout.write(self.run(shape, size, options))
+
+    def run(self, shape, size, options):
+        workflow_service = WorkflowService()
+        jobs_data, successors = build_jobs(shape, size, options['seed'])
+        workflow = workflow_service.create_workflow(f'bench-{shape}-{size}', 'bench_engine', jobs_data)
+
+        bench = EngineBench(options['workers'], options['job_duration'])
+        original_send_task = current_app.send_task
+        original_client = (docker_client._client, docker_client._client_pid)
+        original_record_attempt = JobAttemptService.record_attempt
+        current_app.send_task = bench.send_task
+        # 측정용 Job의 시도 기록이 실제 시도 기록 버퍼에 쌓이지 않도록 한다.
+        JobAttemptService.record_attempt = lambda *args, **kwargs: None
+        docker_client._client, docker_client._client_pid = FakeDockerClient(bench), os.getpid()
+        docker_client._image_cache.clear()
+        restore_redis = bench.count_redis()
+        try:
+            with override_settings(CONTAINER_SUPERVISION_MODE='blocking', DOCKER_WARM_POOL_IMAGES=[], DOCKER_IMAGE_PREWARM=False):
+                started_at = time.perf_counter()
+                bench.container_exited_at = started_at
+                history_uuid = workflow_service.execute_workflow(workflow['uuid'])
+                execute_elapsed = time.perf_counter() - started_at
+                bench.flush_pending(execute_elapsed)
+                task_count, task_elapsed, makespan = bench.drain(execute_elapsed)
+        finally:
+            restore_redis()
+            current_app.send_task = original_send_task
+            JobAttemptService.record_attempt = original_record_attempt
+            docker_client._client, docker_client._client_pid = original_client
+            docker_client._image_cache.clear()
+
+        run_status = History.objects.get(uuid=history_uuid).status
+        workflow_service.delete_workflow(workflow['uuid'])
+
+        depth = critical_path_length(successors)
+        critical_path = depth * options['job_duration']
+        # 워커 수가 제한되어 있으므로 임계 경로와 전체 작업량/워커 수 중 큰 값이 makespan의 하한이다.
+        lower_bound = max(critical_path, size * options['job_duration'] / options['workers'])
+        latencies = [latency * 1000 for latency in bench.dispatch_latencies]
+        return (
+            f"{shape:>8} {size:>6} {depth:>6} {task_count / (execute_elapsed + task_elapsed):>8.1f} "
+            f"{percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+            f"{makespan:>9.2f} {critical_path:>9.2f} {lower_bound:>9.2f} {makespan / lower_bound:>6.2f} "
+            f"{bench.redis_commands / size:>9.1f} {bench.redis_round_trips / size:>8.1f} {run_status:>8}"
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from project_apps.service.workflow_service import WorkflowService
+
+
+class Command(BaseCommand):
+    help = 'Job 수 별로 Workflow 생성/수정에 걸리는 시간과 쿼리 수를 측정한다. 측정에 사용한 Workflow는 삭제한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+
+    def handle(self, *args, **options):
+        workflow_service = WorkflowService()
+
+        self.stdout.write(f"{'jobs':>8} {'create(s)':>10} {'queries':>8} {'update(s)':>10} {'queries':>8}")
+        for size in options['sizes']:
+            jobs_data = [
+                {
+                    'name': f'job-{index}',
+                    'image': 'busybox',
+                    'parameters': {'INDEX': str(index)},
+                    'next_job_names': [f'job-{index+1}'] if index+1 < size else []
+                }
+                for index in range(size)
+            ]
+
+            with CaptureQueriesContext(connection) as create_queries:
+                started_at = time.perf_counter()
+                workflow = workflow_service.create_workflow(f'bench-{size}', 'bench_workflow_save', jobs_data)
+                create_elapsed = time.perf_counter() - started_at
+
+            update_data = [{'uuid': str(job['uuid']), 'image': 'alpine', 'timeout': 30} for job in workflow['jobs']]
+            with CaptureQueriesContext(connection) as update_queries:
+                started_at = time.perf_counter()
+                workflow_service.update_workflow(workflow['uuid'], {}, update_data)
+                update_elapsed = time.perf_counter() - started_at
+
+            workflow_service.delete_workflow(workflow['uuid'])
+
+            self.stdout.write(
+                f"{size:>8} {create_elapsed:>10.3f} {len(create_queries):>8} {update_elapsed:>10.3f} {len(update_queries):>8}"
+            )
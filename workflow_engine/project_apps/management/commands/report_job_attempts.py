@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from project_apps.repository.job_repository import JobRepository
+from project_apps.service.job_attempt_service import JobAttemptService
+
+
+class Command(BaseCommand):
+    help = (
+        'Workflow의 Job 별 최근 시도 기록으로 시도 수, 실패 수, 실행 시간과 대기 시간의 p50/p95를 출력한다. '
+        '대기 시간은 Job 시도가 수행 가능해진 시각부터 실제로 실행되기까지의 시간이다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('workflow', help='조회할 Workflow UUID')
+        parser.add_argument('--sample', type=int, default=None, help='Job 별로 사용할 최근 시도 수')
+        parser.add_argument('--flush', action='store_true', help='조회 전에 버퍼에 쌓인 시도 기록을 저장한다')
+
+    def handle(self, *args, **options):
+        job_attempt_service = JobAttemptService()
+        if options['flush']:
+            job_attempt_service.flush_attempts()
+
+        jobs = JobRepository().get_job_list(options['workflow'])
+        stats = job_attempt_service.get_job_stats([job.uuid for job in jobs], options['sample'])
+
+        self.stdout.write(
+            f"{'job':>24} {'attempts':>9} {'failures':>9} {'run p50':>8} {'run p95':>8} {'wait p50':>9} {'wait p95':>9}"
+        )
+        for job in jobs:
+            job_stats = stats.get(str(job.uuid))
+            if not job_stats:
+                self.stdout.write(f"{job.name:>24} {0:>9} {0:>9}")
+                continue
+            values = [
+                f"{job_stats[name]:>{width}.2f}" if job_stats[name] is not None else f"{'-':>{width}}"
+                for name, width in (('duration_p50', 8), ('duration_p95', 8), ('queue_wait_p50', 9), ('queue_wait_p95', 9))
+            ]
+            self.stdout.write(f"{job.name:>24} {job_stats['attempts']:>9} {job_stats['failures']:>9} {' '.join(values)}")
@@ -0,0 +1,38 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from project_apps.constants import HISTORY_STATUS_SUCCESS
+from project_apps.repository.history_repository import HistoryRepository
+
+
+class Command(BaseCommand):
+    help = (
+        '성공한 Workflow 실행의 실제 makespan을 실행 시작 시 예상한 임계 경로 길이와 비교한다. '
+        '비율이 1에 가까울수록 임계 경로의 Job들이 대기 없이 실행되었음을 의미한다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workflow', help='조회할 Workflow UUID. 생략하면 모든 Workflow의 실행을 조회한다.')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        histories = HistoryRepository().get_recent_history_list(HISTORY_STATUS_SUCCESS, options['limit'], options['workflow'])
+
+        self.stdout.write(f"{'history':>36} {'workflow':>36} {'makespan':>9} {'critical':>9} {'ratio':>6}")
+        ratios = []
+        for history in histories:
+            makespan = (history.completed_at - history.started_at).total_seconds()
+            critical_path = history.critical_path_estimate
+            if critical_path:
+                ratios.append(makespan / critical_path)
+                critical_text, ratio_text = f"{critical_path:>9.2f}", f"{makespan / critical_path:>6.2f}"
+            else:
+                critical_text, ratio_text = f"{'-':>9}", f"{'-':>6}"
+            self.stdout.write(f"{str(history.uuid):>36} {str(history.workflow_uuid):>36} {makespan:>9.2f} {critical_text} {ratio_text}")
+
+        if ratios:
+            self.stdout.write(
+                f"runs: {len(ratios)}  ratio median: {statistics.median(ratios):.2f}  "
+                f"min: {min(ratios):.2f}  max: {max(ratios):.2f}"
+            )
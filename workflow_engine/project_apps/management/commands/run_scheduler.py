@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from project_apps.constants import SCHEDULER_MODE_HEAP, SCHEDULER_MODE_TICK
+from project_apps.engine.scheduler import Scheduler, TickScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        '활성화된 Scheduling의 다음 실행 시각을 감시하여 실행 시각이 된 Workflow를 실행한다. '
+        'heap 모드는 메모리의 힙으로, tick 모드는 주기적인 데이터베이스 조회로 실행 시각이 된 Scheduling을 찾는다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=[SCHEDULER_MODE_HEAP, SCHEDULER_MODE_TICK], default=None)
+
+    def handle(self, *args, **options):
+        mode = options['mode'] or settings.SCHEDULER_MODE
+        self.stdout.write(f'Running scheduler in {mode} mode...')
+        if mode == SCHEDULER_MODE_TICK:
+            TickScheduler().run()
+        else:
+            Scheduler().run()
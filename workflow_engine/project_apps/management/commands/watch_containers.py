@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from project_apps.engine.container_watcher import ContainerWatcher
+
+
+class Command(BaseCommand):
+    help = 'Job 컨테이너의 종료와 timeout을 감시한다. CONTAINER_SUPERVISION_MODE가 watcher일 때 실행한다.'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Watching job containers...')
+        ContainerWatcher().run()
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0007_alter_scheduling_is_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflow',
+            name='plan',
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0008_workflow_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='retry_backoff',
+            field=models.FloatField(default=2.0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='retry_delay',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='retry_jitter',
+            field=models.FloatField(default=0.1),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0009_job_retry_backoff'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workflow',
+            index=models.Index(fields=['created_at', 'uuid'], name='project_app_created_cc886b_idx'),
+        ),
+    ]
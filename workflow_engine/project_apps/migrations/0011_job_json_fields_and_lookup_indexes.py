@@ -0,0 +1,94 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:39
+
+import ast
+
+from django.db import migrations, models
+
+
+def text_to_json(apps, schema_editor):
+    '''
+    Python repr 문자열로 저장된 parameters와 next_job_names를 JSON 값으로 변환한다.
+    '''
+    Job = apps.get_model('project_apps', 'Job')
+    jobs = list(Job.objects.all())
+    for job in jobs:
+        job.parameters_json = ast.literal_eval(job.parameters) if job.parameters else {}
+        job.next_job_names_json = ast.literal_eval(job.next_job_names) if job.next_job_names else []
+    Job.objects.bulk_update(jobs, ['parameters_json', 'next_job_names_json'], batch_size=1000)
+
+
+def json_to_text(apps, schema_editor):
+    '''
+    JSON 값을 기존의 Python repr 문자열로 되돌린다.
+    '''
+    Job = apps.get_model('project_apps', 'Job')
+    jobs = list(Job.objects.all())
+    for job in jobs:
+        job.parameters = str(job.parameters_json)
+        job.next_job_names = str(job.next_job_names_json)
+    Job.objects.bulk_update(jobs, ['parameters', 'next_job_names'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0010_workflow_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='parameters_json',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='next_job_names_json',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='parameters',
+            field=models.TextField(default=''),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='next_job_names',
+            field=models.TextField(default=''),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name='job',
+            name='parameters',
+        ),
+        migrations.RemoveField(
+            model_name='job',
+            name='next_job_names',
+        ),
+        migrations.RenameField(
+            model_name='job',
+            old_name='parameters_json',
+            new_name='parameters',
+        ),
+        migrations.RenameField(
+            model_name='job',
+            old_name='next_job_names_json',
+            new_name='next_job_names',
+        ),
+        migrations.AddIndex(
+            model_name='history',
+            index=models.Index(fields=['workflow_uuid', 'started_at'], name='project_app_workflo_4a23bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='history',
+            index=models.Index(fields=['status', 'started_at'], name='project_app_status_d19447_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(fields=['workflow_uuid', 'is_active'], name='project_app_workflo_23a97b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(fields=['is_active', 'scheduled_at'], name='project_app_is_acti_ed9d19_idx'),
+        ),
+    ]
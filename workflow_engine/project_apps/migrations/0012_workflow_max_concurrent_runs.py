@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0011_job_json_fields_and_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflow',
+            name='max_concurrent_runs',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0012_workflow_max_concurrent_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='command',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='runtime',
+            field=models.CharField(default='docker', max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='image',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
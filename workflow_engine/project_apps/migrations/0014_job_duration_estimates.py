@@ -0,0 +1,23 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0013_job_runtime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='history',
+            name='critical_path_estimate',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='estimated_duration',
+            field=models.FloatField(default=0),
+        ),
+    ]
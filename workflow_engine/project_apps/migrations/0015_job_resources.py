@@ -0,0 +1,23 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0014_job_duration_estimates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='cpu',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='memory',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:54
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_next_run_at(apps, schema_editor):
+    '''
+    이미 활성화된 Scheduling의 다음 실행 시각을 예정된 시각으로, 예정된 시각이 지났다면 현재 시각으로 설정한다.
+    '''
+    Scheduling = apps.get_model('project_apps', 'Scheduling')
+    now = timezone.now()
+    schedulings = list(Scheduling.objects.filter(is_active=True))
+    for scheduling in schedulings:
+        scheduling.next_run_at = max(scheduling.scheduled_at, now) if scheduling.scheduled_at else now
+    Scheduling.objects.bulk_update(schedulings, ['next_run_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0015_job_resources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='next_run_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(set_next_run_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(fields=['is_active', 'next_run_at'], name='project_app_is_acti_b22ef4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(fields=['updated_at'], name='project_app_updated_e39ac4_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:58
+
+from django.core.cache import cache
+from django.db import migrations, models
+
+
+def move_repeat_counts(apps, schema_editor):
+    '''
+    Redis에 저장되어 있던 활성화된 반복 Scheduling의 남은 반복 횟수를 실행 횟수로 바꾸어 저장하고 Redis 키를 삭제한다.
+    '''
+    Scheduling = apps.get_model('project_apps', 'Scheduling')
+    schedulings = list(Scheduling.objects.filter(is_active=True, interval__isnull=False))
+    repeat_keys = {scheduling.uuid: f"scheduling:{scheduling.uuid}:repeat_count" for scheduling in schedulings}
+    repeat_counts = cache.get_many(list(repeat_keys.values()))
+
+    for scheduling in schedulings:
+        remaining = repeat_counts.get(repeat_keys[scheduling.uuid])
+        if remaining is not None:
+            scheduling.run_count = scheduling.repeat_count - int(remaining) + 1
+    Scheduling.objects.bulk_update(schedulings, ['run_count'], batch_size=1000)
+    cache.delete_many(list(repeat_keys.values()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0016_scheduling_next_run_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='calendar',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='scheduling',
+            name='cron',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='scheduling',
+            name='fire_times',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='scheduling',
+            name='run_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scheduling',
+            name='timezone',
+            field=models.CharField(default='UTC', max_length=64),
+        ),
+        migrations.RunPython(move_repeat_counts, migrations.RunPython.noop),
+    ]
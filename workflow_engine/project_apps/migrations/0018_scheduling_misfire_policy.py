@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0017_scheduling_calendar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='misfire_policy',
+            field=models.CharField(default='coalesce', max_length=20),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.6 on 2026-10-18 18:05
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_apps', '0018_scheduling_misfire_policy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAttempt',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('workflow_uuid', models.UUIDField()),
+                ('history_uuid', models.UUIDField()),
+                ('job_uuid', models.UUIDField()),
+                ('attempt', models.IntegerField(default=0)),
+                ('image', models.CharField(blank=True, default='', max_length=255)),
+                ('image_digest', models.CharField(blank=True, default='', max_length=255)),
+                ('worker', models.CharField(blank=True, default='', max_length=255)),
+                ('queued_at', models.DateTimeField(null=True)),
+                ('started_at', models.DateTimeField(null=True)),
+                ('finished_at', models.DateTimeField(null=True)),
+                ('exit_code', models.IntegerField(null=True)),
+                ('error', models.CharField(blank=True, default='', max_length=255)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job_uuid', 'finished_at'], name='project_app_job_uui_0fad6c_idx'), models.Index(fields=['history_uuid'], name='project_app_history_d4e011_idx')],
+            },
+        ),
+    ]
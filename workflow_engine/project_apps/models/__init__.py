@@ -2,3 +2,4 @@ from project_apps.models.workflow import Workflow
 from project_apps.models.job import Job
 from project_apps.models.history import History
 from project_apps.models.scheduling import Scheduling
+from project_apps.models.job_attempt import JobAttempt
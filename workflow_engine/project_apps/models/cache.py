@@ -1,9 +1,13 @@
 from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis import get_redis_connection
+
+_scripts = {}
 
 
 class Cache:
-    def set(self, key: str, value):
-        cache.set(key, value)
+    def set(self, key: str, value, timeout=DEFAULT_TIMEOUT):
+        cache.set(key, value, timeout)
 
     def get(self, key: str):
         return cache.get(key)
@@ -11,8 +15,124 @@ class Cache:
     def delete(self, key: str):
         cache.delete(key)
 
+    def add(self, key: str, value, timeout=DEFAULT_TIMEOUT):
+        '''
+        키가 없을 때만 값을 저장하고, 저장했는지 여부를 반환한다.
+        '''
+        return cache.add(key, value, timeout)
+
     def incr(self, key: str, delta=1):
         cache.incr(key, delta)
 
     def decr(self, key: str, delta=1):
         cache.decr(key, delta)
+
+    # 여러 키를 한 번의 요청으로 처리하는 연산
+    def get_many(self, keys: list):
+        return cache.get_many(keys)
+
+    def set_many(self, mapping: dict, timeout=DEFAULT_TIMEOUT):
+        cache.set_many(mapping, timeout)
+
+    def delete_many(self, keys: list):
+        cache.delete_many(keys)
+
+    def pipeline(self, transaction=True):
+        '''
+        여러 Redis 명령을 모아 한 번의 요청으로 보내는 파이프라인을 반환한다.
+        transaction이 참이면 명령들을 MULTI/EXEC로 묶어 원자적으로 실행한다.
+        '''
+        return CachePipeline(get_redis_connection().pipeline(transaction=transaction))
+
+    # Redis Hash 연산. 키는 Django 캐시와 같은 네임스페이스를 사용하므로 delete()로 함께 삭제된다.
+    def hset(self, key: str, field: str, value):
+        get_redis_connection().hset(cache.make_key(key), field, value)
+
+    def hset_many(self, key: str, mapping: dict):
+        if mapping:
+            get_redis_connection().hset(cache.make_key(key), mapping=mapping)
+
+    def hget(self, key: str, field: str):
+        return get_redis_connection().hget(cache.make_key(key), field)
+
+    def hmget(self, key: str, fields: list):
+        if not fields:
+            return []
+        return get_redis_connection().hmget(cache.make_key(key), fields)
+
+    def hgetall(self, key: str):
+        return get_redis_connection().hgetall(cache.make_key(key))
+
+    def hdel(self, key: str, fields: list):
+        if fields:
+            get_redis_connection().hdel(cache.make_key(key), *fields)
+
+    def hincrby(self, key: str, field: str, delta=1):
+        return get_redis_connection().hincrby(cache.make_key(key), field, delta)
+
+    # Redis Set 연산
+    def sadd(self, key: str, member: str):
+        get_redis_connection().sadd(cache.make_key(key), member)
+
+    def srem(self, key: str, member: str):
+        get_redis_connection().srem(cache.make_key(key), member)
+
+    def smembers(self, key: str):
+        return get_redis_connection().smembers(cache.make_key(key))
+
+    # Redis List 연산
+    def rpush(self, key: str, *values):
+        return get_redis_connection().rpush(cache.make_key(key), *values)
+
+    def expire(self, key: str, seconds: int):
+        get_redis_connection().expire(cache.make_key(key), seconds)
+
+    def zrem(self, key: str, member: str):
+        get_redis_connection().zrem(cache.make_key(key), member)
+
+    def run_script(self, script: str, keys: list, args: list):
+        '''
+        Lua 스크립트를 Redis 서버에서 원자적으로 실행한다. 스크립트는 SHA로 캐싱되어 재사용된다.
+        '''
+        if script not in _scripts:
+            _scripts[script] = get_redis_connection().register_script(script)
+        return _scripts[script](keys=[cache.make_key(key) for key in keys], args=args)
+
+
+class CachePipeline:
+    '''
+    Cache의 Redis 연산을 모아 execute() 시점에 한 번의 요청으로 보내는 파이프라인.
+    with 문으로 사용하면 블록이 예외 없이 끝날 때 자동으로 execute()한다.
+    '''
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        self._pipeline.reset()
+
+    def execute(self):
+        return self._pipeline.execute()
+
+    def delete(self, key: str):
+        self._pipeline.delete(cache.make_key(key))
+
+    def hset_many(self, key: str, mapping: dict):
+        if mapping:
+            self._pipeline.hset(cache.make_key(key), mapping=mapping)
+
+    def hget(self, key: str, field: str):
+        self._pipeline.hget(cache.make_key(key), field)
+
+    def hincrby(self, key: str, field: str, delta=1):
+        self._pipeline.hincrby(cache.make_key(key), field, delta)
+
+    def expire(self, key: str, seconds: int):
+        self._pipeline.expire(cache.make_key(key), seconds)
+
+    def zrem(self, key: str, member: str):
+        self._pipeline.zrem(cache.make_key(key), member)
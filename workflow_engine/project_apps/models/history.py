@@ -14,3 +14,10 @@ class History(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True)
+    critical_path_estimate = models.FloatField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['workflow_uuid', 'started_at']),
+            models.Index(fields=['status', 'started_at']),
+        ]
@@ -6,12 +6,20 @@ class Job(models.Model):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     workflow_uuid = models.UUIDField()
     name = models.CharField(max_length=255)
-    image = models.CharField(max_length=255)
-    parameters = models.TextField()
-    next_job_names = models.TextField()
+    image = models.CharField(max_length=255, blank=True, default='')
+    runtime = models.CharField(max_length=32, default='docker')
+    command = models.JSONField(default=list)
+    parameters = models.JSONField(default=dict)
+    next_job_names = models.JSONField(default=list)
     depends_count = models.IntegerField()
     timeout = models.IntegerField(default=0)
     retries = models.IntegerField(default=0)
+    retry_delay = models.IntegerField(default=1)
+    retry_backoff = models.FloatField(default=2.0)
+    retry_jitter = models.FloatField(default=0.1)
+    estimated_duration = models.FloatField(default=0)
+    cpu = models.FloatField(default=0)
+    memory = models.IntegerField(default=0)
 
     class Meta:
         unique_together = ('workflow_uuid', 'name')
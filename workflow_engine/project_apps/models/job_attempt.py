@@ -0,0 +1,24 @@
+from django.db import models
+import uuid
+
+
+class JobAttempt(models.Model):
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workflow_uuid = models.UUIDField()
+    history_uuid = models.UUIDField()
+    job_uuid = models.UUIDField()
+    attempt = models.IntegerField(default=0)
+    image = models.CharField(max_length=255, blank=True, default='')
+    image_digest = models.CharField(max_length=255, blank=True, default='')
+    worker = models.CharField(max_length=255, blank=True, default='')
+    queued_at = models.DateTimeField(null=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    exit_code = models.IntegerField(null=True)
+    error = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job_uuid', 'finished_at']),
+            models.Index(fields=['history_uuid']),
+        ]
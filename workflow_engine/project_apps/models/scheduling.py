@@ -7,7 +7,22 @@ class Scheduling(models.Model):
     workflow_uuid = models.UUIDField()
     scheduled_at = models.DateTimeField(null=True)
     interval = models.DurationField(null=True)
+    cron = models.CharField(max_length=255, blank=True, default='')
+    timezone = models.CharField(max_length=64, default='UTC')
+    calendar = models.JSONField(default=list, blank=True)
     repeat_count = models.IntegerField(default=0)
+    run_count = models.IntegerField(default=0)
+    misfire_policy = models.CharField(max_length=20, default='coalesce')
     is_active = models.BooleanField(default=False)
+    next_run_at = models.DateTimeField(null=True)
+    fire_times = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['workflow_uuid', 'is_active']),
+            models.Index(fields=['is_active', 'scheduled_at']),
+            models.Index(fields=['is_active', 'next_run_at']),
+            models.Index(fields=['updated_at']),
+        ]
@@ -8,11 +8,14 @@ class HistoryRepository:
     '''
     History 정보를 관리하는 리포지토리.
     '''
-    def create_history(self, workflow_uuid):
+    def create_history(self, workflow_uuid, history_uuid=None, critical_path_estimate=None):
         '''
-        History 정보를 생성한다.
+        History 정보를 생성한다. history_uuid가 주어지면 이를 History의 UUID로 사용한다.
         '''
-        history = History.objects.create(workflow_uuid=workflow_uuid)
+        if history_uuid is None:
+            history = History.objects.create(workflow_uuid=workflow_uuid, critical_path_estimate=critical_path_estimate)
+        else:
+            history = History.objects.create(uuid=history_uuid, workflow_uuid=workflow_uuid, critical_path_estimate=critical_path_estimate)
         return history
 
     def get_history(self, history_uuid):
@@ -21,6 +24,16 @@ class HistoryRepository:
         '''
         return History.objects.get(uuid=history_uuid)
 
+    def get_recent_history_list(self, status, limit, workflow_uuid=None):
+        '''
+        주어진 상태로 종료된 History를 최근에 시작된 순서로 최대 limit개 반환한다.
+        workflow_uuid가 주어지면 해당 Workflow의 History만 반환한다.
+        '''
+        histories = History.objects.filter(status=status, completed_at__isnull=False)
+        if workflow_uuid is not None:
+            histories = histories.filter(workflow_uuid=workflow_uuid)
+        return list(histories.order_by('-started_at')[:limit])
+
     def delete_history(self, history_uuid):
         '''
         일치하는 History 정보를 삭제한다.
@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+import orjson as json
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from project_apps.models import JobAttempt
+from project_apps.models.cache import Cache
+
+JOB_ATTEMPT_BUFFER_KEY = 'job_attempt_buffer'
+JOB_ATTEMPT_FLUSH_KEY = 'job_attempt_flush_scheduled'
+
+# KEYS: buffer, flush_scheduled
+# ARGV: 기록, 저장 예약 유지 시간(초)
+# 기록을 버퍼에 추가하고 {버퍼 길이, 저장 예약 여부}를 반환한다. 저장 예약은 유지 시간 동안 한 번만 성공한다.
+BUFFER_ATTEMPT_SCRIPT = '''
+local length = redis.call('RPUSH', KEYS[1], ARGV[1])
+local scheduled = redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[2])
+if scheduled then
+    return {length, 1}
+end
+return {length, 0}
+'''
+
+# KEYS: buffer
+# ARGV: 꺼낼 기록 수
+# 버퍼의 앞에서부터 기록을 꺼내 반환한다. 조회와 삭제를 원자적으로 수행하므로 여러 워커가 동시에 꺼내도 중복되지 않는다.
+POP_ATTEMPTS_SCRIPT = '''
+local attempts = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+redis.call('LTRIM', KEYS[1], #attempts, -1)
+return attempts
+'''
+
+TIMESTAMP_FIELDS = ('queued_at', 'started_at', 'finished_at')
+
+
+class JobAttemptRepository:
+    '''
+    Job 시도 별 실행 기록을 관리하는 리포지토리.
+    엔진은 기록을 Redis List 버퍼에 쌓고, 버퍼의 기록은 묶어서 데이터베이스에 저장한다.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def buffer_attempt(self, attempt, flush_interval):
+        '''
+        Job 시도 기록을 버퍼에 추가하고 (버퍼에 쌓인 기록 수, 저장 예약 여부)를 반환한다. 시각은 epoch 초로 전달한다.
+        저장 예약은 flush_interval(초)마다 한 번만 성공하므로 기록이 많아도 저장 요청이 몰리지 않는다.
+        '''
+        length, scheduled = self.cache.run_script(
+            BUFFER_ATTEMPT_SCRIPT,
+            keys=[JOB_ATTEMPT_BUFFER_KEY, JOB_ATTEMPT_FLUSH_KEY],
+            args=[json.dumps(attempt), max(int(flush_interval), 1)]
+        )
+        return length, bool(scheduled)
+
+    def restore_attempts(self, attempts):
+        '''
+        꺼낸 Job 시도 기록들을 버퍼에 되돌린다.
+        '''
+        if attempts:
+            self.cache.rpush(JOB_ATTEMPT_BUFFER_KEY, *[json.dumps(attempt) for attempt in attempts])
+
+    def pop_buffered_attempts(self, count):
+        '''
+        버퍼에서 최대 count개의 Job 시도 기록을 꺼내 반환한다.
+        '''
+        attempts = self.cache.run_script(POP_ATTEMPTS_SCRIPT, keys=[JOB_ATTEMPT_BUFFER_KEY], args=[count])
+        return [json.loads(attempt) for attempt in attempts]
+
+    def create_attempts(self, attempts, batch_size):
+        '''
+        Job 시도 기록들을 batch_size개씩 묶어서 저장한다.
+        '''
+        job_attempts = []
+        for attempt in attempts:
+            fields = dict(attempt)
+            for field in TIMESTAMP_FIELDS:
+                if fields.get(field) is not None:
+                    fields[field] = datetime.fromtimestamp(fields[field], tz=timezone.utc)
+            job_attempts.append(JobAttempt(**fields))
+        JobAttempt.objects.bulk_create(job_attempts, batch_size=batch_size)
+
+    def get_recent_attempt_list(self, job_uuids, sample_size, succeeded_only=False):
+        '''
+        Job 별로 최근에 종료된 시도를 최대 sample_size개씩 (Job UUID, 대기 시작 시각, 실행 시작 시각, 종료 시각, 종료 코드) 리스트로 반환한다.
+        '''
+        attempts = JobAttempt.objects.filter(job_uuid__in=job_uuids, finished_at__isnull=False)
+        if succeeded_only:
+            attempts = attempts.filter(exit_code=0)
+        attempts = attempts.annotate(
+            recent_rank=Window(RowNumber(), partition_by=F('job_uuid'), order_by=F('finished_at').desc())
+        ).filter(recent_rank__lte=sample_size)
+        return list(attempts.values_list('job_uuid', 'queued_at', 'started_at', 'finished_at', 'exit_code'))
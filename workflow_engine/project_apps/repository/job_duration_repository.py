@@ -0,0 +1,42 @@
+from project_apps.models.cache import Cache
+
+JOB_DURATIONS_KEY = 'job_durations'
+
+# KEYS: job_durations
+# ARGV: job_uuid, 실행 시간(초), 평활 계수
+# 저장된 값이 없다면 실행 시간을, 있다면 지수 이동 평균을 저장한다.
+RECORD_DURATION_SCRIPT = '''
+local duration = tonumber(ARGV[2])
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current then
+    duration = tonumber(current) + tonumber(ARGV[3]) * (duration - tonumber(current))
+end
+redis.call('HSET', KEYS[1], ARGV[1], tostring(duration))
+'''
+
+
+class JobDurationRepository:
+    '''
+    성공한 Job의 실행 시간 지수 이동 평균을 Job UUID 별 Redis Hash 필드로 관리하는 리포지토리.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def record_duration(self, job_uuid, duration, smoothing):
+        '''
+        Job의 실행 시간(초)을 지수 이동 평균에 반영한다.
+        '''
+        self.cache.run_script(RECORD_DURATION_SCRIPT, keys=[JOB_DURATIONS_KEY], args=[str(job_uuid), duration, smoothing])
+
+    def get_durations(self, job_uuids):
+        '''
+        Job UUID 리스트와 같은 순서로 기록된 실행 시간을 반환한다. 기록이 없는 Job은 None이다.
+        '''
+        durations = self.cache.hmget(JOB_DURATIONS_KEY, [str(job_uuid) for job_uuid in job_uuids])
+        return [float(duration) if duration is not None else None for duration in durations]
+
+    def delete_durations(self, job_uuids):
+        '''
+        Job들의 실행 시간 기록을 삭제한다.
+        '''
+        self.cache.hdel(JOB_DURATIONS_KEY, [str(job_uuid) for job_uuid in job_uuids])
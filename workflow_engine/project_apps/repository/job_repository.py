@@ -2,12 +2,14 @@ from django.db import IntegrityError
 
 from project_apps.models import Job
 
+BULK_BATCH_SIZE = 1000
+
 
 class JobRepository:
     '''
     Job 정보를 관리하는 리포지토리.
     '''
-    def create_job(self, workflow_uuid, name, image, parameters, next_job_names, depends_count=0, timeout=0, retries=0):
+    def create_job(self, workflow_uuid, name, image, parameters, next_job_names, depends_count=0, timeout=0, retries=0, retry_delay=1, retry_backoff=2.0, retry_jitter=0.1, runtime='docker', command=None, estimated_duration=0, cpu=0, memory=0):
         '''
         Job 정보를 생성한다.
         '''
@@ -16,17 +18,56 @@ class JobRepository:
                 workflow_uuid=workflow_uuid,
                 name=name,
                 image=image,
+                runtime=runtime,
+                command=command or [],
                 parameters=parameters,
                 next_job_names=next_job_names,
                 depends_count=depends_count,
                 timeout=timeout,
-                retries=retries
+                retries=retries,
+                retry_delay=retry_delay,
+                retry_backoff=retry_backoff,
+                retry_jitter=retry_jitter,
+                estimated_duration=estimated_duration,
+                cpu=cpu,
+                memory=memory
             )
             
             return job
         except Exception as e:
             raise ValueError(str(e))
 
+    def bulk_create_jobs(self, workflow_uuid, jobs_data):
+        '''
+        Job 정보 리스트를 한 번의 요청으로 생성하고, 생성된 Job 리스트를 반환한다.
+        '''
+        jobs = [
+            Job(
+                workflow_uuid=workflow_uuid,
+                name=job_data['name'],
+                image=job_data.get('image', ''),
+                runtime=job_data.get('runtime') or 'docker',
+                command=job_data.get('command') or [],
+                parameters=job_data.get('parameters', {}),
+                next_job_names=job_data.get('next_job_names', []),
+                depends_count=job_data.get('depends_count', 0),
+                timeout=job_data.get('timeout', 0),
+                retries=job_data.get('retries', 0),
+                retry_delay=job_data.get('retry_delay', 1),
+                retry_backoff=job_data.get('retry_backoff', 2.0),
+                retry_jitter=job_data.get('retry_jitter', 0.1),
+                estimated_duration=job_data.get('estimated_duration', 0),
+                cpu=job_data.get('cpu', 0),
+                memory=job_data.get('memory', 0)
+            )
+            for job_data in jobs_data
+        ]
+
+        try:
+            return Job.objects.bulk_create(jobs, batch_size=BULK_BATCH_SIZE)
+        except Exception as e:
+            raise ValueError(str(e))
+
     def get_job(self, job_uuid):
         '''
         일치하는 Job 정보를 반환한다.
@@ -37,7 +78,7 @@ class JobRepository:
         except Exception as e:
             raise ValueError(str(e))
 
-    def update_job(self, job_uuid, name, image, parameters, next_job_names, depends_count, timeout, retries):
+    def update_job(self, job_uuid, name, image, parameters, next_job_names, depends_count, timeout, retries, retry_delay=None, retry_backoff=None, retry_jitter=None, runtime=None, command=None, estimated_duration=None, cpu=None, memory=None):
         '''
         일치하는 Job을 인자에 주어진 정보로 수정한다.
         '''
@@ -55,6 +96,18 @@ class JobRepository:
         except Exception as e:
             raise ValueError(str(e))
 
+    def bulk_update_jobs(self, jobs, fields):
+        '''
+        수정된 Job 모델 객체 리스트의 주어진 필드들을 한 번의 요청으로 저장한다.
+        '''
+        try:
+            Job.objects.bulk_update(jobs, fields, batch_size=BULK_BATCH_SIZE)
+            return jobs
+        except IntegrityError:
+            raise ValueError('Job names must be unique within a workflow.')
+        except Exception as e:
+            raise ValueError(str(e))
+
     def delete_job(self, job_uuid):
         '''
         일치하는 Job 정보를 삭제한다.
@@ -66,9 +119,24 @@ class JobRepository:
         except Exception as e:
             raise ValueError(str(e))
 
+    def delete_job_list(self, workflow_uuid):
+        '''
+        일치하는 Workflow의 모든 Job을 한 번의 요청으로 삭제한다.
+        '''
+        Job.objects.filter(workflow_uuid=workflow_uuid).delete()
+
     def get_job_list(self, workflow_uuid):
         '''
         일치하는 Workflow의 모든 Job 리스트를 반환한다.
         '''
         job_list = Job.objects.filter(workflow_uuid=workflow_uuid)
         return job_list
+
+    def get_job_list_by_workflows(self, workflow_uuids):
+        '''
+        여러 Workflow의 Job 리스트를 한 번의 요청으로 조회하여 Workflow UUID 별로 묶어 반환한다.
+        '''
+        job_lists = {workflow_uuid: [] for workflow_uuid in workflow_uuids}
+        for job in Job.objects.filter(workflow_uuid__in=workflow_uuids):
+            job_lists[job.workflow_uuid].append(job)
+        return job_lists
@@ -0,0 +1,32 @@
+from project_apps.models.cache import Cache
+
+METRICS_KEY = 'metrics'
+
+
+class MetricsRepository:
+    '''
+    엔진 동작 지표를 Redis Hash 카운터로 관리하는 리포지토리.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def increase(self, name, amount=1):
+        '''
+        지표 카운터를 주어진 값만큼 증가시킨다.
+        '''
+        self.cache.hincrby(METRICS_KEY, name, amount)
+
+    def increase_many(self, amounts):
+        '''
+        여러 지표 카운터를 {name: amount} 값만큼 한 번의 요청으로 증가시킨다.
+        '''
+        with self.cache.pipeline(transaction=False) as pipeline:
+            for name, amount in amounts.items():
+                pipeline.hincrby(METRICS_KEY, name, amount)
+
+    def get_metrics(self):
+        '''
+        모든 지표를 {name: value} 형태로 반환한다.
+        '''
+        metrics = self.cache.hgetall(METRICS_KEY)
+        return {name.decode(): int(value) for name, value in metrics.items()}
@@ -0,0 +1,63 @@
+import time
+
+from project_apps.models.cache import Cache
+
+# KEYS: bucket
+# ARGV: 요청 토큰 수, 초당 충전 토큰 수, 최대 토큰 수, 현재 시각
+# 마지막 갱신 이후 충전된 토큰을 더한 뒤 요청한 수와 남은 토큰 수 중 작은 만큼을 꺼내고, 꺼낸 토큰 수를 반환한다.
+ACQUIRE_TOKENS_SCRIPT = '''
+local requested, rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens, updated_at = tonumber(bucket[1]), tonumber(bucket[2])
+if tokens == nil then
+    tokens, updated_at = burst, now
+end
+tokens = math.min(burst, tokens + math.max(now - updated_at, 0) * rate)
+local granted = math.min(requested, math.floor(tokens))
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - granted), 'updated_at', tostring(math.max(now, updated_at)))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return granted
+'''
+
+# KEYS: bucket
+# ARGV: 되돌릴 토큰 수, 최대 토큰 수
+# 사용하지 못한 토큰을 최대 토큰 수까지 되돌린다. 만료된 버킷은 이미 가득 찬 것으로 보므로 되돌리지 않는다.
+RELEASE_TOKENS_SCRIPT = '''
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens == nil then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[2]), tokens + tonumber(ARGV[1]))))
+return 1
+'''
+
+
+class RateLimitRepository:
+    '''
+    여러 프로세스가 함께 사용하는 토큰 버킷을 Redis Hash로 관리하는 리포지토리.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def _key(self, name):
+        return f"rate_limit_{name}"
+
+    def acquire(self, name, count, rate, burst):
+        '''
+        토큰 버킷에서 최대 count개의 토큰을 꺼내고, 꺼낸 토큰 수를 반환한다.
+        버킷은 초당 rate개씩 최대 burst개까지 충전된다.
+        '''
+        if count <= 0:
+            return 0
+        return int(self.cache.run_script(
+            ACQUIRE_TOKENS_SCRIPT,
+            keys=[self._key(name)],
+            args=[count, rate, burst, time.time()]
+        ))
+
+    def release(self, name, count, burst):
+        '''
+        꺼냈지만 사용하지 못한 토큰 count개를 토큰 버킷에 되돌린다.
+        '''
+        if count > 0:
+            self.cache.run_script(RELEASE_TOKENS_SCRIPT, keys=[self._key(name)], args=[count, burst])
@@ -0,0 +1,58 @@
+import time
+
+from project_apps.models.cache import Cache
+
+# KEYS: reservations
+# ARGV: 예약 ID, CPU, 메모리, CPU 상한, 메모리 상한(0은 무제한), 현재 시각, 예약 만료 시각
+# 만료된 예약을 회수한 뒤 남은 자원이 충분하거나 풀에 다른 예약이 없다면 예약하고 1을, 그렇지 않다면 0을 반환한다.
+RESERVE_SCRIPT = '''
+local used_cpu, used_memory, count = 0, 0, 0
+local reservations = redis.call('HGETALL', KEYS[1])
+for i = 1, #reservations, 2 do
+    local cpu, memory, expires_at = string.match(reservations[i+1], '([^,]+),([^,]+),([^,]+)')
+    if tonumber(expires_at) <= tonumber(ARGV[6]) then
+        redis.call('HDEL', KEYS[1], reservations[i])
+    elseif reservations[i] ~= ARGV[1] then
+        used_cpu = used_cpu + tonumber(cpu)
+        used_memory = used_memory + tonumber(memory)
+        count = count + 1
+    end
+end
+local cpu, memory = tonumber(ARGV[2]), tonumber(ARGV[3])
+local cpu_capacity, memory_capacity = tonumber(ARGV[4]), tonumber(ARGV[5])
+if count > 0 and ((cpu_capacity > 0 and used_cpu + cpu > cpu_capacity) or (memory_capacity > 0 and used_memory + memory > memory_capacity)) then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2] .. ',' .. ARGV[3] .. ',' .. ARGV[7])
+return 1
+'''
+
+
+class ResourceRepository:
+    '''
+    자원 풀 별로 실행 중인 Job이 예약한 CPU와 메모리를 Redis Hash로 관리하는 리포지토리.
+    예약에는 만료 시각이 있어 비정상 종료된 워커가 반납하지 못한 자원도 회수된다.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def _key(self, pool):
+        return f"resource_pool_{pool}"
+
+    def reserve(self, pool, reservation_id, cpu, memory, cpu_capacity, memory_capacity, lease):
+        '''
+        자원 풀에 남은 자원이 있다면 lease(초) 동안 자원을 예약하고 True를 반환한다.
+        풀에 다른 예약이 없다면 상한보다 큰 요청도 예약하여 큰 Job이 영원히 대기하지 않도록 한다.
+        '''
+        now = time.time()
+        return bool(self.cache.run_script(
+            RESERVE_SCRIPT,
+            keys=[self._key(pool)],
+            args=[reservation_id, cpu, memory, cpu_capacity, memory_capacity, now, now + lease]
+        ))
+
+    def release(self, pool, reservation_id):
+        '''
+        자원 예약을 반납한다.
+        '''
+        self.cache.hdel(self._key(pool), [reservation_id])
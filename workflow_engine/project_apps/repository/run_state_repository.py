@@ -0,0 +1,210 @@
+import time
+
+import orjson as json
+
+from project_apps.constants import JOB_STATUS_SUCCESS, JOB_STATUS_WAITING, WORKFLOW_STATUS_FAIL, WORKFLOW_STATUS_RUNNING
+from project_apps.models.cache import Cache
+
+# KEYS: results, depends_count, state
+# ARGV: job_uuid, 성공 상태, 대기 상태, Workflow 실패 상태, 다음 Job UUID...
+# Workflow가 실패했다면 nil을, 그렇지 않다면 {실행 가능해진 Job UUID 목록, 완료 여부}를 반환한다.
+# 반환된 Job들은 곧바로 실행 요청되므로 dispatched 카운트에 함께 반영한다.
+COMPLETE_JOB_SCRIPT = '''
+if redis.call('HGET', KEYS[3], 'status') == ARGV[4] then
+    return nil
+end
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return {{}, 0}
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local ready = {}
+for i = 5, #ARGV do
+    if redis.call('HINCRBY', KEYS[2], ARGV[i], -1) == 0 and redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[3] then
+        table.insert(ready, ARGV[i])
+    end
+end
+redis.call('HINCRBY', KEYS[3], 'dispatched', #ready)
+local success = redis.call('HINCRBY', KEYS[3], 'success', 1)
+local total = tonumber(redis.call('HGET', KEYS[3], 'total'))
+if success == total then
+    return {ready, 1}
+end
+return {ready, 0}
+'''
+
+# KEYS: jobs, results, state
+# ARGV: job_uuid, 실행 상태, Workflow 실패 상태
+# Workflow가 실패했거나 Job이 없다면 nil을, 그렇지 않다면 Job을 실행 상태로 바꾸고 Job 정의를 반환한다.
+START_JOB_SCRIPT = '''
+if redis.call('HGET', KEYS[3], 'status') == ARGV[3] then
+    return nil
+end
+local job = redis.call('HGET', KEYS[1], ARGV[1])
+if not job then
+    return nil
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+return job
+'''
+
+# KEYS: active_runs
+# ARGV: history_uuid, 최대 동시 실행 수(0은 무제한), 현재 시각, 회수 기준 시각
+# 슬롯을 확보했다면 1을, 동시 실행 수가 가득 찼다면 0을 반환한다.
+ACQUIRE_RUN_SLOT_SCRIPT = '''
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[4])
+local limit = tonumber(ARGV[2])
+if limit > 0 and redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+'''
+
+RUN_STATE_NAMES = ('jobs', 'results', 'depends_count', 'state', 'running_containers')
+
+
+class RunStateRepository:
+    '''
+    실행 중인 Workflow의 Job 별 상태를 Redis Hash로 관리하는 리포지토리.
+    상태는 실행 History UUID 별로 분리되므로 같은 Workflow의 여러 실행이 서로의 상태를 덮어쓰지 않는다.
+    Job 하나의 상태 변경은 해당 Job의 필드만 읽고 쓴다.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def _key(self, prefix, name):
+        return f"{prefix}_{name}"
+
+    def create_run_state(self, history_uuid, job_list, plan, priorities=None):
+        '''
+        실행 계획을 바탕으로 Job 정의, 실행 결과, 의존성 카운트를 Job UUID 별 필드로 저장하고,
+        곧바로 실행할 수 있는 루트 Job UUID 리스트를 반환한다.
+        Job 인덱스 별 우선순위가 주어지면 각 Job 정의에 자신과 다음 Job들의 우선순위를 함께 저장한다.
+        '''
+        job_dict = {job['uuid']: job for job in job_list}
+        if priorities is None:
+            priorities = [None] * len(plan['job_uuids'])
+
+        jobs, results, depends_counts = {}, {}, {}
+        for index, job_uuid in enumerate(plan['job_uuids']):
+            job = job_dict[job_uuid]
+            job['next_job_uuids'] = [plan['job_uuids'][next_index] for next_index in plan['successors'][index]]
+            job['priority'] = priorities[index]
+            job['next_job_priorities'] = [priorities[next_index] for next_index in plan['successors'][index]]
+            jobs[job_uuid] = json.dumps(job)
+            results[job_uuid] = JOB_STATUS_WAITING
+            depends_counts[job_uuid] = plan['in_degree'][index]
+
+        root_job_uuids = [plan['job_uuids'][index] for index in plan['order'] if plan['in_degree'][index] == 0]
+        with self.cache.pipeline() as pipeline:
+            pipeline.hset_many(self._key(history_uuid, 'jobs'), jobs)
+            pipeline.hset_many(self._key(history_uuid, 'results'), results)
+            pipeline.hset_many(self._key(history_uuid, 'depends_count'), depends_counts)
+            pipeline.hset_many(self._key(history_uuid, 'state'), {
+                'status': WORKFLOW_STATUS_RUNNING,
+                'total': len(job_list),
+                'success': 0,
+                'dispatched': len(root_job_uuids)
+            })
+
+        return root_job_uuids
+
+    def delete_run_state(self, history_uuid):
+        '''
+        Workflow의 실행 상태를 모두 삭제한다.
+        '''
+        self.cache.delete_many([self._key(history_uuid, name) for name in RUN_STATE_NAMES])
+
+    def close_run(self, workflow_uuid, history_uuid, retention):
+        '''
+        종료된 실행의 동시 실행 슬롯을 반납하고, 실행 상태가 retention(초) 뒤에 삭제되도록 한다.
+        늦게 도착한 Job 종료 처리가 실행 상태를 확인할 수 있도록 곧바로 삭제하지 않는다.
+        '''
+        with self.cache.pipeline() as pipeline:
+            pipeline.zrem(self._key(workflow_uuid, 'active_runs'), str(history_uuid))
+            for name in RUN_STATE_NAMES:
+                pipeline.expire(self._key(history_uuid, name), retention)
+
+    def acquire_run_slot(self, workflow_uuid, history_uuid, max_concurrent_runs, stale_after):
+        '''
+        Workflow의 동시 실행 슬롯을 원자적으로 확보한다. max_concurrent_runs가 0이면 제한하지 않는다.
+        stale_after(초)보다 오래된 슬롯은 비정상 종료된 실행으로 보고 회수한다.
+        슬롯을 확보했다면 True를 반환한다.
+        '''
+        now = time.time()
+        return bool(self.cache.run_script(
+            ACQUIRE_RUN_SLOT_SCRIPT,
+            keys=[self._key(workflow_uuid, 'active_runs')],
+            args=[str(history_uuid), max_concurrent_runs, now, now - stale_after]
+        ))
+
+    def release_run_slot(self, workflow_uuid, history_uuid):
+        '''
+        시작하지 못한 실행의 동시 실행 슬롯을 반납한다.
+        '''
+        self.cache.zrem(self._key(workflow_uuid, 'active_runs'), str(history_uuid))
+
+    def get_job(self, history_uuid, job_uuid):
+        '''
+        Job 정의를 반환하고, 없다면 None을 반환한다.
+        '''
+        job = self.cache.hget(self._key(history_uuid, 'jobs'), str(job_uuid))
+        return json.loads(job) if job else None
+
+    def start_job(self, history_uuid, job_uuid, running_status):
+        '''
+        Workflow 실행이 실패하지 않았다면 Job을 실행 상태로 바꾸고 Job 정의를 반환한다.
+        상태 확인, Job 조회, 상태 갱신을 한 번의 요청으로 원자적으로 수행하며, 실행할 수 없다면 None을 반환한다.
+        '''
+        job = self.cache.run_script(
+            START_JOB_SCRIPT,
+            keys=[self._key(history_uuid, 'jobs'), self._key(history_uuid, 'results'), self._key(history_uuid, 'state')],
+            args=[str(job_uuid), running_status, WORKFLOW_STATUS_FAIL]
+        )
+        return json.loads(job) if job else None
+
+    def set_job_result(self, history_uuid, job_uuid, result):
+        '''
+        Job의 실행 결과를 갱신한다.
+        '''
+        self.cache.hset(self._key(history_uuid, 'results'), str(job_uuid), result)
+
+    def complete_job(self, history_uuid, job_uuid, next_job_uuids):
+        '''
+        Job 성공 처리와 다음 Job들의 의존성 카운트 감소를 한 번의 요청으로 원자적으로 수행한다.
+        Workflow가 이미 실패했다면 None을, 그렇지 않다면 (실행 가능해진 Job UUID 목록, Workflow 완료 여부)를 반환한다.
+        '''
+        result = self.cache.run_script(
+            COMPLETE_JOB_SCRIPT,
+            keys=[
+                self._key(history_uuid, 'results'),
+                self._key(history_uuid, 'depends_count'),
+                self._key(history_uuid, 'state')
+            ],
+            args=[str(job_uuid), JOB_STATUS_SUCCESS, JOB_STATUS_WAITING, WORKFLOW_STATUS_FAIL, *next_job_uuids]
+        )
+        if result is None:
+            return None
+
+        ready_job_uuids, completed = result
+        return [ready_job_uuid.decode() for ready_job_uuid in ready_job_uuids], bool(completed)
+
+    def get_workflow_status(self, history_uuid):
+        '''
+        실행 중인 Workflow의 상태를 반환한다.
+        '''
+        status = self.cache.hget(self._key(history_uuid, 'state'), 'status')
+        return status.decode() if status else None
+
+    def set_workflow_status(self, history_uuid, status):
+        '''
+        실행 중인 Workflow의 상태를 갱신한다.
+        '''
+        self.cache.hset(self._key(history_uuid, 'state'), 'status', status)
+
+    def get_dispatch_count(self, history_uuid):
+        '''
+        실행 요청된 Job의 수와 전체 Job의 수를 반환한다.
+        '''
+        state = self.cache.hgetall(self._key(history_uuid, 'state'))
+        return int(state.get(b'dispatched', 0)), int(state.get(b'total', 0))
@@ -1,16 +1,21 @@
 from datetime import timedelta
 
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
+from django.db.models import F
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
+from project_apps.constants import SCHEDULING_MISFIRE_COALESCE
 from project_apps.models import Scheduling, Workflow
 
+SCHEDULING_CHUNK_SIZE = 1000
+
 
 class SchedulingRepository:
     '''
     Scheduling 정보를 관리하는 리포지토리.
     '''
-    def create_scheduling(self, workflow_uuid, scheduled_at, interval, repeat_count):
+    def create_scheduling(self, workflow_uuid, scheduled_at, interval, repeat_count, cron='', timezone='UTC', calendar=None, misfire_policy=None):
         '''
         Scheduling 정보를 생성한다.
         '''
@@ -24,7 +29,11 @@ class SchedulingRepository:
                 workflow_uuid=workflow_uuid, 
                 scheduled_at=parse_scheduled_at, 
                 interval=parse_interval, 
-                repeat_count=repeat_count
+                repeat_count=repeat_count,
+                cron=cron or '',
+                timezone=timezone or 'UTC',
+                calendar=calendar or [],
+                misfire_policy=misfire_policy or SCHEDULING_MISFIRE_COALESCE
             )
             return scheduling
         except Exception as e:
@@ -54,16 +63,22 @@ class SchedulingRepository:
         scheduling_list = Scheduling.objects.all()
         return list(scheduling_list.values())
 
-    def update_scheduling(self, scheduling_uuid, scheduled_at, interval, repeat_count):
+    def update_scheduling(self, scheduling_uuid, scheduled_at, interval, repeat_count, cron=None, timezone=None, calendar=None, misfire_policy=None, replace_schedule=False):
         '''
         일치하는 Scheduling을 인자에 주어진 정보로 수정한다.
+        replace_schedule이 참이면 반복 주기, cron 표현식, 실행 시각 리스트를 주어진 값으로 바꾸고 주어지지 않은 값은 비운다.
         '''
         try:
             scheduling = Scheduling.objects.get(uuid=scheduling_uuid)
             
             scheduling.scheduled_at = parse_datetime(scheduled_at) if scheduled_at else scheduling.scheduled_at
-            scheduling.interval = timedelta(**interval) if interval else scheduling.interval
             scheduling.repeat_count = repeat_count if repeat_count else scheduling.repeat_count
+            if replace_schedule:
+                scheduling.interval = timedelta(**interval) if interval else None
+                scheduling.cron = cron or ''
+                scheduling.calendar = calendar or []
+            scheduling.timezone = timezone if timezone else scheduling.timezone
+            scheduling.misfire_policy = misfire_policy if misfire_policy else scheduling.misfire_policy
 
             scheduling.save()
 
@@ -82,13 +97,73 @@ class SchedulingRepository:
         except Exception as e:
             raise ValueError(str(e))
         
-    def activate_scheduling(self, scheduling_uuid):
+    def get_active_next_runs(self):
+        '''
+        활성화된 모든 Scheduling의 (UUID, 다음 실행 시각)을 나누어 읽어 반환한다.
+        '''
+        return Scheduling.objects.filter(is_active=True, next_run_at__isnull=False).values_list('uuid', 'next_run_at').iterator(chunk_size=SCHEDULING_CHUNK_SIZE)
+
+    def get_changed_next_runs(self, since):
+        '''
+        since 이후 수정된 Scheduling의 (UUID, 활성화 여부, 다음 실행 시각) 리스트를 반환한다.
+        '''
+        return list(Scheduling.objects.filter(updated_at__gte=since).values_list('uuid', 'is_active', 'next_run_at'))
+
+    def get_next_run_list(self, scheduling_uuids):
+        '''
+        주어진 Scheduling의 (UUID, 활성화 여부, 다음 실행 시각) 리스트를 반환한다. 삭제된 Scheduling은 포함하지 않는다.
+        '''
+        return list(Scheduling.objects.filter(uuid__in=scheduling_uuids).values_list('uuid', 'is_active', 'next_run_at'))
+
+    def get_due_scheduling_list(self, scheduling_uuids, now):
+        '''
+        주어진 Scheduling 중 활성화되어 있고 다음 실행 시각이 now 이전인 Scheduling 리스트를 잠가서 반환한다.
+        다른 트랜잭션이 잠근 Scheduling은 건너뛰므로 트랜잭션 안에서 호출해야 한다.
+        '''
+        return list(Scheduling.objects.select_for_update(skip_locked=True).filter(uuid__in=scheduling_uuids, is_active=True, next_run_at__lte=now))
+
+    def lock_due_scheduling_list(self, now, limit, after=None):
+        '''
+        활성화되어 있고 다음 실행 시각이 now 이전(after가 주어지면 after 이후)인 Scheduling을 실행 시각 순서로 최대 limit개 잠가서 반환한다.
+        (is_active, next_run_at) 인덱스로 조회하며, 다른 트랜잭션이 잠근 Scheduling은 건너뛰므로 트랜잭션 안에서 호출해야 한다.
+        '''
+        schedulings = Scheduling.objects.select_for_update(skip_locked=True).filter(is_active=True, next_run_at__lte=now)
+        if after is not None:
+            schedulings = schedulings.filter(next_run_at__gt=after)
+        return list(schedulings.order_by('next_run_at')[:limit])
+
+    def update_next_runs(self, next_runs):
+        '''
+        {Scheduling UUID: (다음 실행 시각, 미리 계산한 이후 실행 시각 리스트, 실행 여부)}에 따라 다음 실행 시각을 갱신하고,
+        실행된 Scheduling의 실행 횟수를 1 늘린다. 다음 실행 시각이 None인 Scheduling은 비활성화한다.
+        갱신할 값이 같은 Scheduling들은 하나의 UPDATE 문으로 함께 갱신한다.
+        update()는 auto_now를 적용하지 않으므로, 다른 스케줄러가 변경 사항을 읽을 수 있도록 수정 시각을 직접 갱신한다.
+        '''
+        updated_at = timezone.now()
+        groups = {}
+        for scheduling_uuid, (next_run_at, fire_times, is_fired) in next_runs.items():
+            groups.setdefault((next_run_at, tuple(fire_times), is_fired), []).append(scheduling_uuid)
+
+        for (next_run_at, fire_times, is_fired), scheduling_uuids in groups.items():
+            for index in range(0, len(scheduling_uuids), SCHEDULING_CHUNK_SIZE):
+                Scheduling.objects.filter(uuid__in=scheduling_uuids[index:index+SCHEDULING_CHUNK_SIZE]).update(
+                    next_run_at=next_run_at,
+                    fire_times=list(fire_times),
+                    is_active=next_run_at is not None,
+                    run_count=F('run_count') + int(is_fired),
+                    updated_at=updated_at
+                )
+
+    def activate_scheduling(self, scheduling_uuid, next_run_at, fire_times):
         '''
-        일치하는 Scheduling를 활성화한다.
+        일치하는 Scheduling를 활성화하고 실행 횟수를 초기화한 뒤 다음 실행 시각과 미리 계산한 이후 실행 시각들을 설정한다.
         '''
         try:    
             scheduling = Scheduling.objects.get(uuid=scheduling_uuid)
             scheduling.is_active = True
+            scheduling.run_count = 0
+            scheduling.next_run_at = next_run_at
+            scheduling.fire_times = fire_times
             scheduling.save()
             return True, "스케줄링이 활성화되었습니다."
         except Exception as e:
@@ -101,6 +176,8 @@ class SchedulingRepository:
         try:
             scheduling = Scheduling.objects.get(uuid=scheduling_uuid)
             scheduling.is_active = False
+            scheduling.next_run_at = None
+            scheduling.fire_times = []
             scheduling.save()
             return True, "스케줄링이 비활성화되었습니다."
         except Exception as e:
@@ -0,0 +1,45 @@
+from django.conf import settings
+
+from project_apps.models.cache import Cache
+
+
+class WorkflowDefinitionRepository:
+    '''
+    직렬화된 Workflow 정의와 실행 계획을 Redis에 캐싱하는 리포지토리.
+    정의는 Workflow 별 버전 번호가 붙은 키에 저장되며, 무효화는 버전 번호를 올려 이전 정의를 더 이상 읽지 않게 한다.
+    '''
+    def __init__(self):
+        self.cache = Cache()
+
+    def _version_key(self, workflow_uuid):
+        return f"{workflow_uuid}_definition_version"
+
+    def _definition_key(self, workflow_uuid, version):
+        return f"{workflow_uuid}_definition_{version}"
+
+    def get_version(self, workflow_uuid):
+        '''
+        Workflow 정의의 현재 버전 번호를 반환한다.
+        '''
+        return self.cache.get(self._version_key(workflow_uuid)) or 0
+
+    def get_definition(self, workflow_uuid, version):
+        '''
+        주어진 버전의 Workflow 정의를 반환하고, 없다면 None을 반환한다.
+        '''
+        return self.cache.get(self._definition_key(workflow_uuid, version))
+
+    def set_definition(self, workflow_uuid, version, definition):
+        '''
+        주어진 버전의 Workflow 정의를 WORKFLOW_DEFINITION_CACHE_TTL 동안 저장한다.
+        '''
+        self.cache.set(self._definition_key(workflow_uuid, version), definition, timeout=settings.WORKFLOW_DEFINITION_CACHE_TTL)
+
+    def invalidate(self, workflow_uuid):
+        '''
+        Workflow 정의의 버전 번호를 올려 캐싱된 정의를 무효화한다.
+        '''
+        try:
+            self.cache.incr(self._version_key(workflow_uuid))
+        except ValueError:
+            self.cache.set(self._version_key(workflow_uuid), 1)
@@ -1,4 +1,5 @@
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
+from django.db.models import Q
 
 from project_apps.models import Workflow
 
@@ -7,12 +8,12 @@ class WorkflowRepository:
     '''
     Workflow 정보를 관리하는 리포지토리.
     '''
-    def create_workflow(self, name, description):
+    def create_workflow(self, name, description, max_concurrent_runs=0):
         '''
         Workflow 정보를 생성한다.
         '''
         try:
-            workflow = Workflow.objects.create(name=name, description=description)
+            workflow = Workflow.objects.create(name=name, description=description, max_concurrent_runs=max_concurrent_runs)
             return workflow
         except Exception as e:
             raise ValueError(str(e))
@@ -27,7 +28,7 @@ class WorkflowRepository:
         except Exception as e:
             raise ValueError(str(e))
 
-    def update_workflow(self, workflow_uuid, name, description):
+    def update_workflow(self, workflow_uuid, name, description, max_concurrent_runs=None):
         '''
         일치하는 Workflow를 인자에 주어진 정보로 수정한다.
         '''
@@ -43,6 +44,12 @@ class WorkflowRepository:
         except Exception as e:
             raise ValueError(str(e))
 
+    def update_workflow_plan(self, workflow_uuid, plan):
+        '''
+        일치하는 Workflow의 실행 계획을 저장한다.
+        '''
+        Workflow.objects.filter(uuid=workflow_uuid).update(plan=plan)
+
     def delete_workflow(self, workflow_uuid):
         '''
         일치하는 Workflow 정보를 삭제한다.
@@ -60,3 +67,14 @@ class WorkflowRepository:
         '''
         workflow_list = Workflow.objects.all()
         return workflow_list
+
+    def get_workflow_page(self, limit, after=None):
+        '''
+        (created_at, uuid) 순으로 after 다음에 오는 Workflow를 최대 limit개 반환한다.
+        after는 직전 페이지 마지막 Workflow의 (created_at, uuid)이다.
+        '''
+        workflows = Workflow.objects.order_by('created_at', 'uuid')
+        if after is not None:
+            created_at, workflow_uuid = after
+            workflows = workflows.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, uuid__gt=workflow_uuid))
+        return list(workflows[:limit])
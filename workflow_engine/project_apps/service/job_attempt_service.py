@@ -0,0 +1,104 @@
+from django.conf import settings
+
+from project_apps.engine.tasks_manager import job_attempts_flush
+from project_apps.repository.job_attempt_repository import JobAttemptRepository
+
+
+def percentile(values, ratio):
+    '''
+    값들의 ratio 분위수를 선형 보간으로 계산하여 반환한다. 값이 없다면 None을 반환한다.
+    '''
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * ratio
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class JobAttemptService:
+    '''
+    Job 시도 별 실행 기록을 남기고, 기록을 바탕으로 Job 별 실행 시간과 대기 시간 통계를 계산하는 서비스.
+    '''
+    def __init__(self):
+        self.job_attempt_repository = JobAttemptRepository()
+
+    def record_attempt(self, workflow_uuid, history_uuid, job_uuid, attempt, image, queued_at, started_at, finished_at, exit_code, image_digest='', worker='', error=''):
+        '''
+        Job 시도 기록을 버퍼에 추가한다. 시각은 epoch 초이며, 종료 코드 없이 끝난 시도는 error에 예외 이름을 남긴다.
+        버퍼에 JOB_ATTEMPT_FLUSH_SIZE개가 쌓이면 곧바로, 그렇지 않다면 JOB_ATTEMPT_FLUSH_INTERVAL 안에 저장을 요청한다.
+        '''
+        length, flush_scheduled = self.job_attempt_repository.buffer_attempt({
+            'workflow_uuid': str(workflow_uuid),
+            'history_uuid': str(history_uuid),
+            'job_uuid': str(job_uuid),
+            'attempt': attempt,
+            'image': image or '',
+            'image_digest': image_digest or '',
+            'worker': worker or '',
+            'queued_at': queued_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+            'exit_code': exit_code,
+            'error': error or '',
+        }, settings.JOB_ATTEMPT_FLUSH_INTERVAL)
+
+        if length % settings.JOB_ATTEMPT_FLUSH_SIZE == 0:
+            job_attempts_flush()
+        elif flush_scheduled:
+            job_attempts_flush(countdown=settings.JOB_ATTEMPT_FLUSH_INTERVAL)
+
+    def flush_attempts(self):
+        '''
+        버퍼가 빌 때까지 Job 시도 기록을 JOB_ATTEMPT_FLUSH_SIZE개씩 꺼내 데이터베이스에 묶어서 저장하고, 저장한 수를 반환한다.
+        저장에 실패한 기록은 버퍼에 되돌려 다음 저장 때 다시 시도한다.
+        '''
+        count = 0
+        while True:
+            attempts = self.job_attempt_repository.pop_buffered_attempts(settings.JOB_ATTEMPT_FLUSH_SIZE)
+            if not attempts:
+                return count
+
+            try:
+                self.job_attempt_repository.create_attempts(attempts, settings.JOB_ATTEMPT_FLUSH_SIZE)
+            except Exception:
+                self.job_attempt_repository.restore_attempts(attempts)
+                raise
+            count += len(attempts)
+
+    def get_job_stats(self, job_uuids, sample_size=None):
+        '''
+        Job 별 최근 시도 최대 sample_size개로 {Job UUID: 통계}를 계산하여 반환한다.
+        통계는 시도 수, 실패 수, 성공한 시도의 실행 시간(초)과 대기 시간(초)의 p50/p95를 포함한다.
+        '''
+        sample_size = sample_size or settings.JOB_ATTEMPT_STATS_SAMPLE
+        attempts_by_job = {}
+        for job_uuid, queued_at, started_at, finished_at, exit_code in self.job_attempt_repository.get_recent_attempt_list(job_uuids, sample_size):
+            attempts_by_job.setdefault(str(job_uuid), []).append((queued_at, started_at, finished_at, exit_code))
+
+        stats = {}
+        for job_uuid, attempts in attempts_by_job.items():
+            durations = [(finished_at - started_at).total_seconds() for _, started_at, finished_at, exit_code in attempts if exit_code == 0 and started_at]
+            queue_waits = [max((started_at - queued_at).total_seconds(), 0) for queued_at, started_at, _, _ in attempts if queued_at and started_at]
+            stats[job_uuid] = {
+                'attempts': len(attempts),
+                'failures': sum(1 for *_, exit_code in attempts if exit_code != 0),
+                'duration_p50': percentile(durations, 0.5),
+                'duration_p95': percentile(durations, 0.95),
+                'queue_wait_p50': percentile(queue_waits, 0.5),
+                'queue_wait_p95': percentile(queue_waits, 0.95),
+            }
+        return stats
+
+    def get_duration_percentiles(self, job_uuids, ratio, sample_size=None):
+        '''
+        Job 별 최근 성공한 시도 최대 sample_size개의 실행 시간(초) ratio 분위수를 {Job UUID: 실행 시간}으로 반환한다.
+        성공한 시도가 없는 Job은 포함하지 않는다.
+        '''
+        durations_by_job = {}
+        attempts = self.job_attempt_repository.get_recent_attempt_list(job_uuids, sample_size or settings.JOB_ATTEMPT_STATS_SAMPLE, succeeded_only=True)
+        for job_uuid, _, started_at, finished_at, _ in attempts:
+            if started_at:
+                durations_by_job.setdefault(str(job_uuid), []).append((finished_at - started_at).total_seconds())
+        return {job_uuid: percentile(durations, ratio) for job_uuid, durations in durations_by_job.items()}
@@ -0,0 +1,15 @@
+from project_apps.repository.metrics_repository import MetricsRepository
+
+
+class MetricsService:
+    '''
+    엔진 동작 지표를 조회하는 서비스.
+    '''
+    def __init__(self):
+        self.metrics_repository = MetricsRepository()
+
+    def get_metrics(self):
+        '''
+        수집된 모든 엔진 동작 지표를 반환한다.
+        '''
+        return self.metrics_repository.get_metrics()
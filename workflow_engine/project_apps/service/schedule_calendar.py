@@ -0,0 +1,85 @@
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from croniter import CroniterBadDateError, croniter
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from project_apps.constants import SCHEDULING_MISFIRE_POLICIES
+
+
+def get_zone(timezone_name):
+    '''
+    시간대 이름에 해당하는 시간대를 반환한다.
+    '''
+    try:
+        return ZoneInfo(timezone_name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{timezone_name}'")
+
+
+def parse_calendar(calendar):
+    '''
+    실행 시각 문자열 리스트를 검증하여 중복 없이 정렬된 UTC ISO 문자열 리스트로 반환한다. 시간대가 없는 시각은 UTC로 본다.
+    '''
+    if not isinstance(calendar, list):
+        raise ValueError("calendar must be a list of date-time strings")
+
+    fire_times = set()
+    for value in calendar:
+        fire_time = parse_datetime(value) if isinstance(value, str) else None
+        if fire_time is None:
+            raise ValueError(f"Invalid calendar date-time '{value}'")
+        if timezone.is_naive(fire_time):
+            fire_time = timezone.make_aware(fire_time, dt_timezone.utc)
+        fire_times.add(fire_time.astimezone(dt_timezone.utc))
+    return [fire_time.isoformat() for fire_time in sorted(fire_times)]
+
+
+def validate_schedule(interval, cron, timezone_name, calendar, misfire_policy=None):
+    '''
+    반복 주기, cron 표현식, 실행 시각 리스트 중 하나만 지정되었는지와 각 값 및 늦어진 실행 처리 방식이 올바른지 확인한다.
+    '''
+    if sum(1 for value in (interval, cron, calendar) if value) > 1:
+        raise ValueError("Only one of interval, cron and calendar can be set")
+    if cron and not croniter.is_valid(cron):
+        raise ValueError(f"Invalid cron expression '{cron}'")
+    get_zone(timezone_name)
+    if calendar:
+        parse_calendar(calendar)
+    if misfire_policy and misfire_policy not in SCHEDULING_MISFIRE_POLICIES:
+        raise ValueError(f"Unknown misfire policy '{misfire_policy}'")
+
+
+def compute_fire_times(scheduling, after, count):
+    '''
+    cron 또는 실행 시각 리스트로 정의된 Scheduling의 after 이후 실행 시각을 최대 count개 계산하여 UTC 시각 리스트로 반환한다.
+    cron 표현식은 Scheduling의 시간대 기준으로 해석하므로 일광 절약 시간이 바뀌어도 현지 시각을 따른다.
+    '''
+    if scheduling.calendar:
+        fire_times = (parse_datetime(value) for value in scheduling.calendar)
+        return [fire_time for fire_time in fire_times if fire_time > after][:count]
+
+    iterator = croniter(scheduling.cron, after.astimezone(get_zone(scheduling.timezone)))
+    fire_times = []
+    try:
+        for _ in range(count):
+            fire_times.append(iterator.get_next(datetime).astimezone(dt_timezone.utc))
+    except CroniterBadDateError:
+        # 2월 30일처럼 다시 오지 않는 실행 시각
+        pass
+    return fire_times
+
+
+def dump_fire_times(fire_times):
+    '''
+    실행 시각 리스트를 JSON으로 저장할 ISO 문자열 리스트로 변환한다.
+    '''
+    return [fire_time.isoformat() for fire_time in fire_times]
+
+
+def load_fire_times(fire_times):
+    '''
+    저장된 ISO 문자열 리스트를 실행 시각 리스트로 변환한다.
+    '''
+    return [parse_datetime(value) for value in fire_times]
@@ -1,9 +1,17 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
 from project_apps.api.serializers import serialize_scheduling
-from project_apps.engine.scheduling_execute import execute_scheduling
+from project_apps.constants import SCHEDULING_MISFIRE_FIRE_ALL, SCHEDULING_MISFIRE_SKIP
+from project_apps.engine.tasks_manager import scheduled_workflows_execute
+from project_apps.repository.metrics_repository import MetricsRepository
+from project_apps.repository.rate_limit_repository import RateLimitRepository
 from project_apps.repository.scheduling_repository import SchedulingRepository
+from project_apps.service.schedule_calendar import compute_fire_times, dump_fire_times, load_fire_times, parse_calendar, validate_schedule
 
 
 class SchedulingService:
@@ -12,16 +20,24 @@ class SchedulingService:
     '''
     def __init__(self):
         self.scheduling_repository = SchedulingRepository()
+        self.rate_limit_repository = RateLimitRepository()
+        self.metrics_repository = MetricsRepository()
 
-    def create_scheduling(self, workflow_uuid, scheduled_at, interval, repeat_count):
+    def create_scheduling(self, workflow_uuid, scheduled_at, interval, repeat_count, cron=None, timezone_name=None, calendar=None, misfire_policy=None):
         '''
         입력 받은 데이터를 바탕으로 Scheduling을 생성한다.
+        반복 주기(interval), cron 표현식(cron), 실행 시각 리스트(calendar) 중 하나로 반복 실행을 정의한다.
         '''
+        validate_schedule(interval, cron, timezone_name, calendar, misfire_policy)
         scheduling = self.scheduling_repository.create_scheduling(
             workflow_uuid=workflow_uuid, 
             scheduled_at=scheduled_at,
             interval=interval,
-            repeat_count=repeat_count
+            repeat_count=repeat_count,
+            cron=cron,
+            timezone=timezone_name,
+            calendar=parse_calendar(calendar) if calendar else None,
+            misfire_policy=misfire_policy
         )
 
         return serialize_scheduling(scheduling)
@@ -46,8 +62,15 @@ class SchedulingService:
                 'workflow_uuid': scheduling['workflow_uuid'],
                 'scheduled_at': scheduling['scheduled_at'],
                 'interval': scheduling['interval'],
+                'cron': scheduling['cron'],
+                'timezone': scheduling['timezone'],
+                'calendar': scheduling['calendar'],
                 'repeat_count': scheduling['repeat_count'],
+                'run_count': scheduling['run_count'],
+                'misfire_policy': scheduling['misfire_policy'],
                 'is_active': scheduling['is_active'],
+                'next_run_at': scheduling['next_run_at'],
+                'fire_times': scheduling['fire_times'],
                 'created_at': scheduling['created_at'],
                 'updated_at': scheduling['updated_at'],
             })
@@ -66,8 +89,15 @@ class SchedulingService:
                 'workflow_uuid': scheduling['workflow_uuid'],
                 'scheduled_at': scheduling['scheduled_at'],
                 'interval': scheduling['interval'],
+                'cron': scheduling['cron'],
+                'timezone': scheduling['timezone'],
+                'calendar': scheduling['calendar'],
                 'repeat_count': scheduling['repeat_count'],
+                'run_count': scheduling['run_count'],
+                'misfire_policy': scheduling['misfire_policy'],
                 'is_active': scheduling['is_active'],
+                'next_run_at': scheduling['next_run_at'],
+                'fire_times': scheduling['fire_times'],
                 'created_at': scheduling['created_at'],
                 'updated_at': scheduling['updated_at'],
             })
@@ -78,17 +108,27 @@ class SchedulingService:
     def update_scheduling(self, scheduling_uuid, scheduling_data):
         '''
         입력 받은 Scheduling을 전송 받은 데이터로 수정한다.
+        반복 주기, cron 표현식, 실행 시각 리스트 중 하나가 주어지면 반복 방식을 그 값으로 바꾸고 나머지 방식의 값은 비운다.
         '''
         scheduling = self.scheduling_repository.get_scheduling(scheduling_uuid)
 
         if scheduling.is_active:
             return False, "스케줄링이 이미 활성화되었으므로 업데이트할 수 없습니다."
+
+        interval, cron, calendar = scheduling_data.get('interval'), scheduling_data.get('cron'), scheduling_data.get('calendar')
+        timezone_name = scheduling_data.get('timezone')
+        validate_schedule(interval, cron, timezone_name, calendar, scheduling_data.get('misfire_policy'))
          
         scheduling = self.scheduling_repository.update_scheduling(
             scheduling_uuid,
             scheduled_at=scheduling_data.get('scheduled_at'),
-            interval=scheduling_data.get('interval'),
+            interval=interval,
             repeat_count=scheduling_data.get('repeat_count'),
+            cron=cron,
+            timezone=timezone_name,
+            calendar=parse_calendar(calendar) if calendar else None,
+            misfire_policy=scheduling_data.get('misfire_policy'),
+            replace_schedule=bool(interval or cron or calendar)
         )
 
         return True, serialize_scheduling(scheduling)
@@ -115,12 +155,13 @@ class SchedulingService:
         if scheduling.scheduled_at and scheduling.scheduled_at < timezone.now():
             return False, "스케줄링 예정된 시간이 지났습니다."
             
-        success, message = self.scheduling_repository.activate_scheduling(scheduling_uuid)
-        if scheduling.scheduled_at:
-            delay = (scheduling.scheduled_at - timezone.now()).total_seconds()
-            execute_scheduling.apply_async((scheduling_uuid,), countdown=delay)
-        else:
-            execute_scheduling.delay(scheduling_uuid)
+        # 실행은 스케줄러 프로세스가 next_run_at을 보고 수행한다.
+        next_run_at, fire_times = scheduling.scheduled_at or timezone.now(), []
+        if scheduling.cron or scheduling.calendar:
+            next_run_at, fire_times = self.get_upcoming_runs(scheduling, next_run_at)
+            if next_run_at is None:
+                return False, "예정된 실행 시각이 없습니다."
+        success, message = self.scheduling_repository.activate_scheduling(scheduling_uuid, next_run_at, fire_times)
 
         return success, message
 
@@ -137,3 +178,173 @@ class SchedulingService:
         success, message = self.scheduling_repository.deactivate_scheduling(scheduling_uuid)
 
         return success, message
+
+    def get_active_next_runs(self):
+        '''
+        활성화된 모든 Scheduling의 (UUID, 다음 실행 시각)을 반환한다.
+        '''
+        return self.scheduling_repository.get_active_next_runs()
+
+    def get_changed_next_runs(self, since):
+        '''
+        since 이후 수정된 Scheduling의 (UUID, 활성화 여부, 다음 실행 시각) 리스트를 반환한다.
+        '''
+        return self.scheduling_repository.get_changed_next_runs(since)
+
+    def get_next_run_list(self, scheduling_uuids):
+        '''
+        주어진 Scheduling의 (UUID, 활성화 여부, 다음 실행 시각) 리스트를 반환한다.
+        '''
+        return self.scheduling_repository.get_next_run_list(scheduling_uuids)
+
+    @contextmanager
+    def fire_transaction(self):
+        '''
+        Scheduling 실행 트랜잭션을 시작하고, 트랜잭션 안에서 꺼낸 따라잡기 토큰 수를 담을 리스트를 넘겨준다.
+        토큰은 Redis에서 꺼내므로 트랜잭션이 롤백되면 꺼낸 토큰을 되돌린다.
+        '''
+        acquired = []
+        try:
+            with transaction.atomic():
+                yield acquired
+        except Exception:
+            self.release_catchup_runs(sum(acquired))
+            raise
+
+    def fire_schedulings(self, scheduling_uuids, now):
+        '''
+        주어진 Scheduling 중 실행 시각이 된 Scheduling들을 실행한다.
+        (처리한 Scheduling의 {UUID: 다음 실행 시각 또는 None}, 따라잡기 속도 제한으로 미룬 Scheduling UUID 집합)을 반환한다.
+        '''
+        with self.fire_transaction() as acquired:
+            return self.fire(self.scheduling_repository.get_due_scheduling_list(scheduling_uuids, now), now, acquired)
+
+    def fire_due_schedulings(self, now, limit):
+        '''
+        실행 시각이 된 Scheduling을 최대 limit개 잠가서 실행하고, 처리한 수를 반환한다.
+        제 시각의 Scheduling을 먼저 잠그고 남은 수만큼 늦어진 Scheduling을 잠가, 밀린 실행이 제 시각의 실행을 막지 않도록 한다.
+        다른 스케줄러가 잠근 Scheduling은 건너뛰므로 여러 스케줄러가 동시에 실행되어도 같은 실행이 중복되지 않는다.
+        '''
+        misfired_before = self.get_misfire_threshold(now)
+        with self.fire_transaction() as acquired:
+            schedulings = self.scheduling_repository.lock_due_scheduling_list(now, limit, after=misfired_before)
+            if len(schedulings) < limit:
+                schedulings += self.scheduling_repository.lock_due_scheduling_list(misfired_before, limit - len(schedulings))
+            next_runs, _ = self.fire(schedulings, now, acquired)
+        return len(next_runs)
+
+    def fire(self, schedulings, now, acquired):
+        '''
+        잠근 Scheduling들의 실행 횟수와 다음 실행 시각을 함께 갱신하고, 커밋된 뒤 Workflow 실행을 묶어서 요청한다.
+        SCHEDULER_MISFIRE_GRACE_TIME보다 늦어진 Scheduling은 misfire_policy에 따라 처리하며, 늦어진 실행은 모든 스케줄러가 함께 쓰는
+        따라잡기 속도 제한 안에서 오래 밀린 순서대로 실행하고 나머지는 미룬다. 반복이 끝난 Scheduling은 비활성화한다.
+        꺼낸 따라잡기 토큰 수는 acquired에 더하며, 지표는 커밋된 뒤에 기록한다.
+        (처리한 Scheduling의 {UUID: 다음 실행 시각 또는 None}, 미룬 Scheduling UUID 집합)을 반환한다.
+        '''
+        misfired_before = self.get_misfire_threshold(now)
+        misfired = sorted((scheduling for scheduling in schedulings if scheduling.next_run_at <= misfired_before), key=lambda scheduling: scheduling.next_run_at)
+        skipped = {scheduling.uuid for scheduling in misfired if scheduling.misfire_policy == SCHEDULING_MISFIRE_SKIP}
+        catching_up = [scheduling for scheduling in misfired if scheduling.misfire_policy != SCHEDULING_MISFIRE_SKIP]
+        deferred = {scheduling.uuid for scheduling in catching_up[self.acquire_catchup_runs(len(catching_up), acquired):]}
+
+        next_runs, fired = {}, []
+        for scheduling in schedulings:
+            if scheduling.uuid in deferred:
+                continue
+
+            if scheduling.uuid in skipped:
+                # 실행하지 않고 다음 실행 시각으로 넘어가므로 실행 횟수를 늘리지 않는다.
+                is_fired = False
+                is_recurring = scheduling.interval or scheduling.cron or scheduling.calendar
+                next_run_at, fire_times = self.get_next_runs(scheduling, now) if is_recurring else (None, [])
+            else:
+                # fire_all은 밀린 실행 시각을 하나씩만 넘기므로 다음 tick에서 남은 실행 시각이 이어서 실행된다.
+                is_fired = True
+                after = scheduling.next_run_at if scheduling.misfire_policy == SCHEDULING_MISFIRE_FIRE_ALL else now
+                next_run_at, fire_times = self.get_next_runs(scheduling, after) if self.has_remaining_runs(scheduling) else (None, [])
+                fired.append((scheduling.uuid, scheduling.workflow_uuid))
+
+            next_runs[scheduling.uuid] = (next_run_at, fire_times, is_fired)
+            if next_run_at is None:
+                print(f"{scheduling.uuid} 스케줄링 마지막 작업 완료 후 종료됩니다.")
+        self.scheduling_repository.update_next_runs(next_runs)
+        if skipped or deferred:
+            transaction.on_commit(lambda: self.metrics_repository.increase_many({
+                'scheduling_misfire_skips': len(skipped), 'scheduling_catchup_deferrals': len(deferred)
+            }))
+
+        transaction.on_commit(lambda: self.dispatch_scheduled_workflows(fired))
+
+        return {scheduling_uuid: next_run_at for scheduling_uuid, (next_run_at, _, _) in next_runs.items()}, deferred
+
+    def get_misfire_threshold(self, now):
+        '''
+        다음 실행 시각이 이 시각 이전인 Scheduling을 늦어진 것으로 본다.
+        '''
+        return now - timedelta(seconds=settings.SCHEDULER_MISFIRE_GRACE_TIME)
+
+    def acquire_catchup_runs(self, count, acquired):
+        '''
+        늦어진 실행 count개 중 지금 실행할 수 있는 수를 반환하고, 꺼낸 토큰 수를 acquired에 더한다.
+        SCHEDULER_CATCHUP_RATE가 0이면 제한하지 않는다.
+        '''
+        if not settings.SCHEDULER_CATCHUP_RATE:
+            return count
+        granted = self.rate_limit_repository.acquire('scheduler_catchup', count, settings.SCHEDULER_CATCHUP_RATE, settings.SCHEDULER_CATCHUP_BURST)
+        acquired.append(granted)
+        return granted
+
+    def release_catchup_runs(self, count):
+        '''
+        실행하지 못한 늦어진 실행 count개의 토큰을 되돌린다.
+        '''
+        if settings.SCHEDULER_CATCHUP_RATE:
+            self.rate_limit_repository.release('scheduler_catchup', count, settings.SCHEDULER_CATCHUP_BURST)
+
+    def dispatch_scheduled_workflows(self, fired):
+        '''
+        (Scheduling UUID, Workflow UUID) 리스트를 SCHEDULER_DISPATCH_CHUNK_SIZE개씩 나누어 task 하나로 실행을 요청한다.
+        '''
+        for index in range(0, len(fired), settings.SCHEDULER_DISPATCH_CHUNK_SIZE):
+            scheduled_workflows_execute(fired[index:index+settings.SCHEDULER_DISPATCH_CHUNK_SIZE])
+
+    def has_remaining_runs(self, scheduling):
+        '''
+        이번 실행 뒤에도 반복할 횟수가 남았는지 확인한다. repeat_count는 첫 실행 이후의 반복 횟수이며,
+        cron과 실행 시각 리스트로 정의된 Scheduling은 repeat_count가 0이면 횟수를 제한하지 않는다.
+        '''
+        if scheduling.cron or scheduling.calendar:
+            return not scheduling.repeat_count or scheduling.run_count < scheduling.repeat_count
+        return bool(scheduling.interval) and scheduling.run_count < scheduling.repeat_count
+
+    def get_next_runs(self, scheduling, after):
+        '''
+        실행된 반복 Scheduling의 after 이후 (다음 실행 시각, 미리 계산한 이후 실행 시각 리스트)를 반환한다.
+        after까지의 실행 시각은 이번 실행으로 합쳐진다.
+        '''
+        if scheduling.interval:
+            return self.get_next_run_at(scheduling, after), []
+
+        # 미리 계산한 실행 시각이 남아 있다면 표현식을 다시 해석하지 않는다.
+        fire_times = [fire_time for fire_time in load_fire_times(scheduling.fire_times) if fire_time > after]
+        if fire_times:
+            return fire_times[0], dump_fire_times(fire_times[1:])
+        return self.get_upcoming_runs(scheduling, max(after, scheduling.next_run_at))
+
+    def get_upcoming_runs(self, scheduling, after):
+        '''
+        cron 또는 실행 시각 리스트로 정의된 Scheduling의 after 이후 다음 실행 시각과,
+        그 뒤로 SCHEDULER_PRECOMPUTED_FIRE_TIMES개의 실행 시각 리스트를 계산한다. 실행 시각이 없다면 (None, [])를 반환한다.
+        '''
+        fire_times = compute_fire_times(scheduling, after, settings.SCHEDULER_PRECOMPUTED_FIRE_TIMES + 1)
+        if not fire_times:
+            return None, []
+        return fire_times[0], dump_fire_times(fire_times[1:])
+
+    def get_next_run_at(self, scheduling, after):
+        '''
+        실행된 반복 Scheduling의 after 이후 다음 실행 시각을 반환한다.
+        다음 실행 시각은 예정되었던 실행 시각에 주기를 더해 구하므로 실행 지연이 누적되지 않는다.
+        '''
+        missed = max((after - scheduling.next_run_at) // scheduling.interval, 0)
+        return scheduling.next_run_at + scheduling.interval * (missed + 1)
@@ -1,12 +1,18 @@
-import orjson as json
+from django.conf import settings
 
-from project_apps.constants import HISTORY_STATUS_FAIL, HISTORY_STATUS_SUCCESS, JOB_STATUS_SUCCESS, JOB_STATUS_FAIL, WORKFLOW_STATUS_FAIL, WORKFLOW_STATUS_SUCCESS
+from project_apps.constants import HISTORY_STATUS_FAIL, HISTORY_STATUS_SUCCESS, JOB_STATUS_RUNNING, JOB_STATUS_SUCCESS, JOB_STATUS_FAIL, WORKFLOW_STATUS_FAIL, WORKFLOW_STATUS_SUCCESS
 from project_apps.engine.job_terminate import job_terminate
-from project_apps.engine.tasks_manager import job_dependency
+from project_apps.engine.tasks_manager import job_execute
 from project_apps.models.cache import Cache
 from project_apps.repository.history_repository import HistoryRepository
+from project_apps.repository.job_duration_repository import JobDurationRepository
 from project_apps.repository.job_repository import JobRepository
-from project_apps.service.lock_utils import with_lock
+from project_apps.repository.metrics_repository import MetricsRepository
+from project_apps.repository.resource_repository import ResourceRepository
+from project_apps.repository.run_state_repository import RunStateRepository
+
+# 컨테이너 종료 처리의 선점 기록을 유지하는 시간(초)
+CONTAINER_EXIT_CLAIM_TTL = 24 * 60 * 60
 
 
 class WorkflowManager:
@@ -16,131 +22,182 @@ class WorkflowManager:
     def __init__(self):
         self.job_repository = JobRepository()
         self.history_repository = HistoryRepository()
+        self.run_state_repository = RunStateRepository()
+        self.metrics_repository = MetricsRepository()
+        self.job_duration_repository = JobDurationRepository()
+        self.resource_repository = ResourceRepository()
         self.cache = Cache()
         
-    def find_job_data(self, workflow_uuid, job_uuid):
+    def find_job_data(self, history_uuid, job_uuid):
         '''
-        주어진 Workflow 데이터에서 특정 Job을 찾아 반환하고, 
+        실행 중인 Workflow에서 특정 Job을 찾아 반환하고, 
         찾는 Job이 없다면 None을 반환한다.
         '''
-        workflow_data = json.loads(self.cache.get(workflow_uuid))
-        for job in workflow_data:
-            if job['uuid'] == str(job_uuid):
-                return job
-        return None
+        return self.run_state_repository.get_job(history_uuid, job_uuid)
 
-    @with_lock
-    def update_job_status(self, workflow_uuid, job_uuid, status):
+    def start_job(self, history_uuid, job_uuid):
         '''
-        특정 Job의 상태를 갱신하고, 변경된 Workflow 데이터를 캐시에 저장한다.
+        Workflow 실행이 실패하지 않았다면 Job을 실행 상태로 바꾸고 Job 정보를 반환한다.
+        실행할 수 없다면 None을 반환한다.
         '''
-        workflow_data = json.loads(self.cache.get(workflow_uuid))
+        job_data = self.run_state_repository.start_job(history_uuid, job_uuid, JOB_STATUS_RUNNING)
+        if job_data:
+            print(f"{str(job_uuid), JOB_STATUS_RUNNING}")
+        return job_data
 
-        workflow_status = self.check_workflow_status(workflow_uuid)
+    def update_job_status(self, history_uuid, job_uuid, status):
+        '''
+        특정 Job의 상태를 갱신한다.
+        '''
+        workflow_status = self.check_workflow_status(history_uuid)
         if workflow_status == WORKFLOW_STATUS_FAIL:
             if status == JOB_STATUS_FAIL:
-                for job in workflow_data:
-                    if job['uuid'] == str(job_uuid):
-                        job['result'] = status
-                        print(f"{job['uuid'], job['result']}")
-                        break
-                self.cache.set(workflow_uuid, json.dumps(workflow_data))
+                self.run_state_repository.set_job_result(history_uuid, job_uuid, status)
+                print(f"{str(job_uuid), status}")
             return False
         else:
-            for job in workflow_data:
-                if job['uuid'] == str(job_uuid):
-                    job['result'] = status
-                    print(f"{job['uuid'], job['result']}")
-                    break
-            self.cache.set(workflow_uuid, json.dumps(workflow_data))
+            self.run_state_repository.set_job_result(history_uuid, job_uuid, status)
+            print(f"{str(job_uuid), status}")
             return True
 
-    @with_lock
-    def update_workflow_status(self, workflow_uuid, status):
+    def update_workflow_status(self, workflow_uuid, history_uuid, status):
         '''
-        Workflow의 상태를 갱신한다. 만약 상태가 실패로 갱신된 경우, 
+        Workflow 실행의 상태를 갱신한다. 만약 상태가 실패로 갱신된 경우, 
 		실행 중인 모든 도커 컨테이너를 종료한다.
         '''
-        self.cache.set(f"{workflow_uuid}_status", status)
+        self.run_state_repository.set_workflow_status(history_uuid, status)
         if status == WORKFLOW_STATUS_FAIL:
-            running_containers = self.cache.get(f"{workflow_uuid}_running_containers")
-            if running_containers:
-                for container_id in running_containers:
-                    job_terminate.apply_async(args=[container_id])
-            print(f"Workflow {workflow_uuid} has failed and is now terminated.")
+            for container_id in self.cache.smembers(f"{history_uuid}_running_containers"):
+                job_terminate.apply_async(args=[container_id.decode()])
+            print(f"Workflow {workflow_uuid} run {history_uuid} has failed and is now terminated.")
 
         else:
-            print(f"Workflow {workflow_uuid} has successfully completed and is now terminated.")
+            print(f"Workflow {workflow_uuid} run {history_uuid} has successfully completed and is now terminated.")
     
-    def check_workflow_status(self, workflow_uuid):
+    def check_workflow_status(self, history_uuid):
         '''
-        Workflow의 상태를 확인한다.
+        Workflow 실행의 상태를 확인한다.
         '''
-        return self.cache.get(f"{workflow_uuid}_status")
+        return self.run_state_repository.get_workflow_status(history_uuid)
 
-    @with_lock
     def handle_success(self, job_data, workflow_uuid, history_uuid):
         '''
-        성공한 Job을 처리하고, 해당 Job에 의존하는 다음 Job들의 상태를 갱신한다.
+        성공한 Job을 처리하고, 해당 Job에 의존하는 다음 Job들 중 의존성 카운트가 0이 된 Job들만 곧바로 실행한다.
+        Workflow가 이미 실패 상태라면 False를 반환한다.
         '''
-        updated = False 
+        result = self.run_state_repository.complete_job(history_uuid, job_data['uuid'], job_data.get('next_job_uuids', []))
+        if result is None:
+            return False
+        print(f"{job_data['uuid'], JOB_STATUS_SUCCESS}")
 
-        workflow_data = json.loads(self.cache.get(workflow_uuid))
-        next_job_names_str = job_data.get('next_job_names',[])
-        next_job_names = json.loads(next_job_names_str.replace("'", "\""))
+        ready_job_uuids, completed = result
+        priorities = dict(zip(job_data.get('next_job_uuids', []), job_data.get('next_job_priorities', [])))
+        self.dispatch_jobs(workflow_uuid, history_uuid, ready_job_uuids, priorities)
 
-        if next_job_names: 
-            for next_job_name in next_job_names:
-                for job in workflow_data:
-                    if job['name'] == next_job_name:
-                        job['depends_count'] -= 1
-                        updated = True
+        if completed:
+            self.complete_workflow(workflow_uuid, history_uuid)
 
-        if updated:
-            self.cache.set(workflow_uuid, json.dumps(workflow_data))
-            job_dependency(workflow_uuid, history_uuid)
+        return True
 
-        self.check_workflow_completion(workflow_uuid, history_uuid)
+    def dispatch_jobs(self, workflow_uuid, history_uuid, job_uuids, priorities=None):
+        '''
+        실행 가능해진 Job들의 실행을 요청한다. {Job UUID: 우선순위}가 주어지면
+        임계 경로에 가까운 Job부터 해당 우선순위로 요청한다.
+        '''
+        priorities = priorities or {}
+        for job_uuid in sorted(job_uuids, key=lambda job_uuid: priorities.get(job_uuid) or 0):
+            job_execute(workflow_uuid, history_uuid, job_uuid, priority=priorities.get(job_uuid))
+
+    def record_job_duration(self, job_uuid, duration):
+        '''
+        성공한 Job의 실행 시간(초)을 다음 실행의 우선순위 계산에 사용할 수 있도록 기록한다.
+        '''
+        self.job_duration_repository.record_duration(job_uuid, duration, settings.JOB_DURATION_SMOOTHING)
 
     def handle_failure(self, workflow_uuid, history_uuid):
         '''
         실패한 Job을 처리한다.
-        Workflow 실패 상태를 설정하고, 실행 History를 갱신한다.
+        Workflow 실패 상태를 설정하고, 실행 History를 갱신한 뒤 동시 실행 슬롯을 반납한다.
         '''
-        self.update_workflow_status(workflow_uuid, WORKFLOW_STATUS_FAIL)
+        self.update_workflow_status(workflow_uuid, history_uuid, WORKFLOW_STATUS_FAIL)
         self.history_repository.update_history_status(history_uuid, HISTORY_STATUS_FAIL)
+        self.finish_run(workflow_uuid, history_uuid)
 
-    def check_workflow_completion(self, workflow_uuid, history_uuid):
+    def complete_workflow(self, workflow_uuid, history_uuid):
         '''
-        Workflow의 모든 Job이 성공적으로 완료되었는지 확인한다.
-        모든 Job이 성공적으로 완료되면, History 상태를 갱신하고 Workflow 데이터를 캐시에서 삭제한다.
+        모든 Job이 성공적으로 완료된 Workflow를 처리한다.
+        Workflow 성공 상태를 설정하고, 실행 History를 갱신한 뒤 동시 실행 슬롯을 반납한다.
         '''
-        workflow_data = json.loads(self.cache.get(workflow_uuid))
-        completed = True
-        for job in workflow_data:
-            if job.get('result') != JOB_STATUS_SUCCESS:
-                completed = False
-                break
+        self.update_workflow_status(workflow_uuid, history_uuid, WORKFLOW_STATUS_SUCCESS)
+        self.history_repository.update_history_status(history_uuid, HISTORY_STATUS_SUCCESS)
+        self.finish_run(workflow_uuid, history_uuid)
 
-        if completed:
-            self.update_workflow_status(workflow_uuid, WORKFLOW_STATUS_SUCCESS)
-            self.history_repository.update_history_status(history_uuid, HISTORY_STATUS_SUCCESS)
+        dispatch_count, job_count = self.run_state_repository.get_dispatch_count(history_uuid)
+        self.metrics_repository.increase_many({
+            'workflow_runs_completed': 1,
+            'jobs_dispatched': dispatch_count,
+            'dispatch_mismatch_runs': int(dispatch_count != job_count)
+        })
+        print(f"Workflow {workflow_uuid} run {history_uuid} dispatched {dispatch_count} jobs for {job_count} jobs.")
+
+    def finish_run(self, workflow_uuid, history_uuid):
+        '''
+        종료된 실행의 동시 실행 슬롯을 반납하고, 실행 상태가 RUN_STATE_RETENTION 뒤에 삭제되도록 한다.
+        '''
+        self.run_state_repository.close_run(workflow_uuid, history_uuid, settings.RUN_STATE_RETENTION)
+
+    def reserve_resources(self, job_data, history_uuid, attempt):
+        '''
+        Job이 선언한 CPU와 메모리를 워커의 자원 풀에 예약한다. 자원을 선언하지 않은 Job은 예약 없이 실행한다.
+        자원 풀에 남은 자원이 부족하다면 False를 반환한다.
+        '''
+        if not job_data.get('cpu') and not job_data.get('memory'):
+            return True
+
+        lease = (job_data.get('timeout') or 10) + settings.JOB_RESOURCE_LEASE_GRACE
+        reserved = self.resource_repository.reserve(
+            settings.WORKER_RESOURCE_POOL,
+            self._reservation_id(history_uuid, job_data['uuid'], attempt),
+            job_data.get('cpu') or 0,
+            job_data.get('memory') or 0,
+            settings.WORKER_CPU_CAPACITY,
+            settings.WORKER_MEMORY_CAPACITY,
+            lease
+        )
+        if not reserved:
+            self.metrics_repository.increase('job_admission_deferrals')
+        return reserved
+
+    def release_resources(self, history_uuid, job_uuid, attempt, pool=None):
+        '''
+        Job의 자원 예약을 반납한다. pool이 주어지지 않으면 현재 워커의 자원 풀에서 반납한다.
+        '''
+        self.resource_repository.release(pool or settings.WORKER_RESOURCE_POOL, self._reservation_id(history_uuid, job_uuid, attempt))
+
+    def _reservation_id(self, history_uuid, job_uuid, attempt):
+        return f"{history_uuid}:{job_uuid}:{attempt}"
+
+    def add_container_to_running_list(self, history_uuid, container_id):
+        '''
+        실행 중인 도커 컨테이너의 ID를 Workflow 실행의 실행중인 컨테이너 집합에 추가한다.
+        '''
+        self.cache.sadd(f"{history_uuid}_running_containers", container_id)
+
+    def remove_container_from_running_list(self, history_uuid, container_id):
+        '''
+        Workflow 실행의 실행 중인 컨테이너 집합에서 특정 컨테이너의 ID를 제거한다.
+        '''
+        self.cache.srem(f"{history_uuid}_running_containers", container_id)
 
-    @with_lock
-    def add_container_to_running_list(self, workflow_uuid, container_id):
+    def claim_container_exit(self, container_id):
         '''
-        실행 중인 도커 컨테이너의 ID를 Workflow의 실행중인 컨테이너 목록에 추가한다.
+        컨테이너의 종료 처리를 선점하고, 선점에 성공했는지 여부를 반환한다.
+        같은 컨테이너의 종료 결과가 여러 번 전달되어도 한 번만 처리되도록 한다.
         '''
-        running_containers = self.cache.get(f"{workflow_uuid}_running_containers")
-        running_containers.append(container_id)
-        self.cache.set(f"{workflow_uuid}_running_containers", running_containers)
+        return self.cache.add(f"{container_id}_exit_claimed", 1, CONTAINER_EXIT_CLAIM_TTL)
 
-    @with_lock
-    def remove_container_from_running_list(self, workflow_uuid, container_id):
+    def release_container_exit(self, container_id):
         '''
-        Workflow의 실행 중인 컨테이너 목록에서 특정 컨테이너의 ID를 제거한다.
+        처리하지 못한 컨테이너 종료의 선점을 해제한다.
         '''
-        running_containers = self.cache.get(f"{workflow_uuid}_running_containers")
-        if container_id in running_containers:
-            running_containers.remove(container_id)
-            self.cache.set(f"{workflow_uuid}_running_containers", running_containers)
+        self.cache.delete(f"{container_id}_exit_claimed")
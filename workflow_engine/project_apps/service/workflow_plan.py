@@ -0,0 +1,69 @@
+from collections import deque
+
+
+def compile_workflow_plan(jobs):
+    '''
+    Job 리스트를 정수 인덱스 기반의 실행 계획으로 컴파일한다.
+    실행 계획은 인덱스 별 Job UUID와 이름, 후행 Job 인덱스 리스트(successors),
+    초기 의존성 카운트(in_degree), 위상 정렬 순서(order)로 구성된다.
+    의존성에 순환이 있다면 ValueError를 발생시킨다.
+    '''
+    job_names = [job.name for job in jobs]
+    name_index_mapping = {name: index for index, name in enumerate(job_names)}
+
+    successors = []
+    in_degree = [0] * len(jobs)
+    for job in jobs:
+        next_indexes = []
+        for next_job_name in job.next_job_names:
+            if next_job_name not in name_index_mapping:
+                raise ValueError(f"Job '{next_job_name}' referenced in next_job_names does not exist")
+            next_index = name_index_mapping[next_job_name]
+            next_indexes.append(next_index)
+            in_degree[next_index] += 1
+        successors.append(next_indexes)
+
+    order = []
+    remaining = list(in_degree)
+    ready = deque(index for index, count in enumerate(remaining) if count == 0)
+    while ready:
+        index = ready.popleft()
+        order.append(index)
+        for next_index in successors[index]:
+            remaining[next_index] -= 1
+            if remaining[next_index] == 0:
+                ready.append(next_index)
+
+    if len(order) != len(jobs):
+        cyclic_names = [job_names[index] for index, count in enumerate(remaining) if count > 0]
+        raise ValueError(f"Jobs {cyclic_names} have a circular dependency")
+
+    return {
+        'job_uuids': [str(job.uuid) for job in jobs],
+        'job_names': job_names,
+        'successors': successors,
+        'in_degree': in_degree,
+        'order': order
+    }
+
+
+def compute_path_ranks(plan, durations):
+    '''
+    Job 인덱스 별 예상 실행 시간으로 각 Job에서 시작하여 Workflow가 끝날 때까지의 가장 긴 경로 길이(rank)를 계산하고,
+    (rank 리스트, Workflow 전체의 임계 경로 길이)를 반환한다.
+    '''
+    ranks = [0.0] * len(plan['job_uuids'])
+    for index in reversed(plan['order']):
+        ranks[index] = durations[index] + max((ranks[next_index] for next_index in plan['successors'][index]), default=0.0)
+    return ranks, max(ranks, default=0.0)
+
+
+def rank_priorities(ranks, levels):
+    '''
+    rank를 0부터 levels-1까지의 task 우선순위로 변환한다. Redis 브로커는 값이 작을수록 먼저 꺼내므로,
+    임계 경로에 있는 Job일수록 0에 가까운 우선순위를 받는다.
+    '''
+    longest = max(ranks, default=0.0)
+    if longest <= 0:
+        return [0] * len(ranks)
+    return [round((levels-1) * (1 - rank / longest)) for rank in ranks]
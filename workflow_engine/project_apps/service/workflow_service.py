@@ -1,17 +1,77 @@
-import ast
-import orjson as json
+import base64
 import uuid
 
+import orjson as json
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
 
-from project_apps.api.serializers import serialize_workflow
-from project_apps.constants import JOB_STATUS_WAITING, WORKFLOW_STATUS_RUNNING
-from project_apps.engine.tasks_manager import job_dependency
-from project_apps.models.cache import Cache
+from project_apps.api.serializers import serialize_workflow, serialize_workflow_info
+from project_apps.constants import HISTORY_STATUS_FAIL, JOB_RUNTIME_DOCKER
+from project_apps.engine.job_runtime import validate_runtime
+from project_apps.engine.tasks_manager import image_prewarm, job_execute
 from project_apps.repository.history_repository import HistoryRepository
+from project_apps.repository.job_duration_repository import JobDurationRepository
 from project_apps.repository.job_repository import JobRepository
+from project_apps.repository.metrics_repository import MetricsRepository
+from project_apps.repository.run_state_repository import RunStateRepository
+from project_apps.repository.workflow_definition_repository import WorkflowDefinitionRepository
 from project_apps.repository.workflow_repository import WorkflowRepository
-from project_apps.service.lock_utils import with_lock
+from project_apps.service.job_attempt_service import JobAttemptService
+from project_apps.service.workflow_plan import compile_workflow_plan, compute_path_ranks, rank_priorities
+
+JOB_UPDATE_FIELDS = [
+    'name', 'image', 'runtime', 'command', 'parameters', 'next_job_names', 'depends_count',
+    'timeout', 'retries', 'retry_delay', 'retry_backoff', 'retry_jitter', 'estimated_duration',
+    'cpu', 'memory'
+]
+
+
+
+def validate_job_runtime(job_data):
+    '''
+    Job의 런타임이 허용된 것인지, 런타임에 필요한 image 또는 command가 주어졌는지 확인한다.
+    '''
+    runtime = job_data.get('runtime') or JOB_RUNTIME_DOCKER
+    validate_runtime(runtime)
+
+    command = job_data.get('command') or []
+    if not isinstance(command, list) or not all(isinstance(arg, str) for arg in command):
+        raise ValueError(f"Job '{job_data.get('name')}' command must be a list of strings")
+    if runtime == JOB_RUNTIME_DOCKER and not job_data.get('image'):
+        raise ValueError(f"Job '{job_data.get('name')}' requires an image to run on the {runtime} runtime")
+    if runtime != JOB_RUNTIME_DOCKER and not command:
+        raise ValueError(f"Job '{job_data.get('name')}' requires a command to run on the {runtime} runtime")
+
+
+def validate_job_resources(job_data):
+    '''
+    Job이 선언한 CPU(코어)와 메모리(MB)가 0 이상의 값인지 확인한다.
+    '''
+    cpu, memory = job_data.get('cpu') or 0, job_data.get('memory') or 0
+    if not isinstance(cpu, (int, float)) or cpu < 0:
+        raise ValueError(f"Job '{job_data.get('name')}' cpu must be a non-negative number")
+    if not isinstance(memory, int) or memory < 0:
+        raise ValueError(f"Job '{job_data.get('name')}' memory must be a non-negative integer")
+
+
+def encode_cursor(workflow):
+    '''
+    Workflow의 (created_at, uuid)를 목록 조회용 cursor 문자열로 변환한다.
+    '''
+    return base64.urlsafe_b64encode(json.dumps([workflow.created_at.isoformat(), str(workflow.uuid)])).decode()
+
+
+def decode_cursor(cursor):
+    '''
+    목록 조회용 cursor 문자열을 (created_at, uuid)로 변환한다.
+    '''
+    try:
+        created_at, workflow_uuid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return parse_datetime(created_at), uuid.UUID(workflow_uuid)
+    except Exception:
+        raise ValueError("Invalid cursor")
 
 
 class WorkflowService:
@@ -22,12 +82,17 @@ class WorkflowService:
         self.workflow_repository = WorkflowRepository()
         self.job_repository = JobRepository()
         self.history_repository = HistoryRepository()
-        self.cache = Cache()
+        self.run_state_repository = RunStateRepository()
+        self.workflow_definition_repository = WorkflowDefinitionRepository()
+        self.metrics_repository = MetricsRepository()
+        self.job_duration_repository = JobDurationRepository()
+        self.job_attempt_service = JobAttemptService()
 
-    def create_workflow(self, name, description, jobs_data):
+    @transaction.atomic
+    def create_workflow(self, name, description, jobs_data, max_concurrent_runs=0):
         '''
         입력 받은 데이터를 바탕으로 의존성 카운트를 계산하고, 
-        Workflow와 Job 리스트를 생성하고 그 결과를 반환한다.
+        Workflow와 Job 리스트 및 실행 계획을 생성하고 그 결과를 반환한다.
         '''
         # Job 이름의 중복 여부 판별
         jobs_name = []
@@ -44,9 +109,15 @@ class WorkflowService:
                 if next_job_name not in jobs_name:
                     raise ValueError (f"Job '{next_job_name}' referenced in next_job_names does not exist")
 
+        # Job 런타임, 실행 대상, 자원 검증
+        for job_data in jobs_data:
+            validate_job_runtime(job_data)
+            validate_job_resources(job_data)
+
         workflow = self.workflow_repository.create_workflow(
             name=name, 
-            description=description
+            description=description,
+            max_concurrent_runs=max_concurrent_runs
         )
 
         depends_count = {job_data['name']: 0 for job_data in jobs_data}
@@ -55,20 +126,12 @@ class WorkflowService:
                 if next_job_name in depends_count:
                     depends_count[next_job_name] += 1
 
-        jobs = []
-        for job_data in jobs_data:
-            job = self.job_repository.create_job(
-                workflow_uuid=workflow.uuid,
-                name=job_data['name'],
-                image=job_data['image'],
-                parameters=job_data.get('parameters', {}),
-                next_job_names=job_data.get('next_job_names', []),
-                depends_count=depends_count[job_data['name']],
-                timeout=job_data.get('timeout', 0),
-                retries=job_data.get('retries', 0)
-            )
-
-            jobs.append(job)
+        jobs = self.job_repository.bulk_create_jobs(
+            workflow.uuid,
+            [{**job_data, 'depends_count': depends_count[job_data['name']]} for job_data in jobs_data]
+        )
+
+        self.workflow_repository.update_workflow_plan(workflow.uuid, compile_workflow_plan(jobs))
 
         return serialize_workflow(workflow, jobs)
 
@@ -76,17 +139,36 @@ class WorkflowService:
         '''
         입력 받은 Workflow와 그에 포함된 Job 리스트를 반환한다.
         '''
-        workflow = self.workflow_repository.get_workflow(workflow_uuid)
+        return self.get_workflow_definition(workflow_uuid)['workflow']
 
-        jobs = self.job_repository.get_job_list(workflow_uuid)
+    def get_workflow_definition(self, workflow_uuid):
+        '''
+        직렬화된 Workflow와 실행 계획을 {'workflow', 'plan'} 형태로 반환한다.
+        캐시에 현재 버전의 정의가 있다면 그대로 반환하고, 없다면 데이터베이스에서 읽어 캐싱한다.
+        '''
+        version = self.workflow_definition_repository.get_version(workflow_uuid)
+        definition = self.workflow_definition_repository.get_definition(workflow_uuid, version)
+        if definition is not None:
+            self.metrics_repository.increase('workflow_definition_cache_hits')
+            return definition
 
-        return serialize_workflow(workflow, jobs)
+        self.metrics_repository.increase('workflow_definition_cache_misses')
+        workflow = self.workflow_repository.get_workflow(workflow_uuid)
+        jobs = list(self.job_repository.get_job_list(workflow_uuid))
+        plan = workflow.plan
+        if not plan and jobs:
+            plan = compile_workflow_plan(jobs)
+            self.workflow_repository.update_workflow_plan(workflow_uuid, plan)
+
+        definition = {'workflow': serialize_workflow(workflow, jobs), 'plan': plan}
+        self.workflow_definition_repository.set_definition(workflow_uuid, version, definition)
+        return definition
 
     @transaction.atomic
     def update_workflow(self, workflow_uuid, workflow_data, jobs_data):
         '''
         입력 받은 Workflow와 Job 리스트를 주어진 데이터로 수정하고, 
-        그 결과를 반환한다.
+        실행 계획을 다시 컴파일한 뒤 그 결과를 반환한다.
         '''
         current_workflow = self.workflow_repository.get_workflow(workflow_uuid)
 
@@ -110,7 +192,7 @@ class WorkflowService:
                 if next_job_name not in jobs_name:
                     raise ValueError(f"'{job_name}' references '{next_job_name}' in its next_job_names, but '{next_job_name}' does not exist")
         
-            old_next_job_names = ast.literal_eval(current_job.next_job_names) if current_job else []
+            old_next_job_names = current_job.next_job_names if current_job else []
 
             for removed_name in set(old_next_job_names) - set(new_next_job_names):
                 removed_uuid = name_uuid_mapping.get(removed_name)
@@ -126,10 +208,18 @@ class WorkflowService:
                 "uuid": job_uuid,
                 "name": job_name,
                 "image": job_data.get('image') if job_data.get('image') else current_job.image,
+                "runtime": job_data.get('runtime') if job_data.get('runtime') else current_job.runtime,
+                "command": job_data.get('command') if job_data.get('command') else current_job.command,
                 "parameters": job_data.get('parameters') if job_data.get('parameters') else current_job.parameters,
                 "next_job_names": new_next_job_names if job_data.get('next_job_names') else current_job.next_job_names,
                 "timeout": job_data.get('timeout') if job_data.get('timeout') else current_job.timeout,
                 "retries": job_data.get('retries') if job_data.get('retries') else current_job.retries,
+                "retry_delay": job_data.get('retry_delay'),
+                "retry_backoff": job_data.get('retry_backoff'),
+                "retry_jitter": job_data.get('retry_jitter'),
+                "estimated_duration": job_data.get('estimated_duration'),
+                "cpu": job_data.get('cpu'),
+                "memory": job_data.get('memory'),
                 "depends_count": existing_jobs_dict[job_uuid].depends_count if job_uuid in existing_jobs_dict else 0
             }
 
@@ -139,38 +229,52 @@ class WorkflowService:
                 job_updates[job_uuid]["depends_count"] = new_count
             else:
                 if job_uuid in existing_jobs_dict:
-                    next_job_names = ast.literal_eval(existing_jobs_dict[job_uuid].next_job_names)
                     job_updates[job_uuid] = {
                         "uuid": existing_jobs_dict[job_uuid].uuid,
                         "name": existing_jobs_dict[job_uuid].name,
                         "image": existing_jobs_dict[job_uuid].image,
+                        "runtime": existing_jobs_dict[job_uuid].runtime,
+                        "command": existing_jobs_dict[job_uuid].command,
                         "parameters": existing_jobs_dict[job_uuid].parameters,
-                        "next_job_names": next_job_names,
+                        "next_job_names": existing_jobs_dict[job_uuid].next_job_names,
                         "timeout": existing_jobs_dict[job_uuid].timeout,
                         "retries": existing_jobs_dict[job_uuid].retries,
+                        "retry_delay": None,
+                        "retry_backoff": None,
+                        "retry_jitter": None,
+                        "estimated_duration": None,
+                        "cpu": None,
+                        "memory": None,
                         "depends_count": new_count
                     }
 
+        # 실제로 값이 바뀐 필드만 모아 한 번에 저장한다.
         update_jobs = []
+        changed_fields = set()
         for job_uuid, update_data in job_updates.items():
-            updated_job = self.job_repository.update_job(
-                job_uuid=update_data['uuid'],
-                name=update_data['name'],
-                image=update_data['image'],
-                parameters=update_data['parameters'],
-                next_job_names=update_data['next_job_names'],
-                depends_count=update_data['depends_count'],
-                timeout=update_data['timeout'],
-                retries=update_data['retries']
-            )
-            update_jobs.append(updated_job)
+            job = existing_jobs_dict.get(job_uuid)
+            if job is None:
+                raise ValueError(f"Job {job_uuid} does not exist in workflow {workflow_uuid}")
+            for field in JOB_UPDATE_FIELDS:
+                if update_data[field] is not None and update_data[field] != getattr(job, field):
+                    setattr(job, field, update_data[field])
+                    changed_fields.add(field)
+            validate_job_runtime({'name': job.name, 'image': job.image, 'runtime': job.runtime, 'command': job.command})
+            validate_job_resources({'name': job.name, 'cpu': job.cpu, 'memory': job.memory})
+            update_jobs.append(job)
+        if changed_fields:
+            self.job_repository.bulk_update_jobs(update_jobs, [field for field in JOB_UPDATE_FIELDS if field in changed_fields])
 
         workflow_info = self.workflow_repository.update_workflow(
             workflow_uuid=workflow_uuid,
             name=workflow_data.get('name') if workflow_data.get('name') else current_workflow.name,
-            description=workflow_data.get('description') if workflow_data.get('description') else current_workflow.description
+            description=workflow_data.get('description') if workflow_data.get('description') else current_workflow.description,
+            max_concurrent_runs=workflow_data.get('max_concurrent_runs')
         )
 
+        self.workflow_repository.update_workflow_plan(workflow_uuid, compile_workflow_plan(list(existing_jobs_dict.values())))
+        transaction.on_commit(lambda: self.workflow_definition_repository.invalidate(workflow_uuid))
+
         return serialize_workflow(workflow_info, update_jobs)
     
 
@@ -184,52 +288,118 @@ class WorkflowService:
         if isinstance(workflow, dict):
             return False
 
-        jobs = self.job_repository.get_job_list(workflow_uuid)
-
+        job_uuids = [job.uuid for job in self.job_repository.get_job_list(workflow_uuid)]
         self.workflow_repository.delete_workflow(workflow.uuid)
 
-        for job in jobs:
-            self.job_repository.delete_job(job.uuid)
+        self.job_repository.delete_job_list(workflow_uuid)
+        transaction.on_commit(lambda: self.workflow_definition_repository.invalidate(workflow_uuid))
+        transaction.on_commit(lambda: self.job_duration_repository.delete_durations(job_uuids))
 
         return True
 
-    def get_workflow_list(self):
+    def get_workflow_list(self, cursor=None, limit=None, include_jobs=True):
         '''
-        모든 Workflow의 정보와 각각의 Job 리스트를 반환한다.
+        cursor 다음에 오는 Workflow를 최대 limit개 반환한다.
+        include_jobs가 참이면 각 Workflow의 Job 리스트를 한 번의 요청으로 함께 조회한다.
+        다음 페이지가 있다면 next_cursor에 다음 요청에 사용할 cursor를 담는다.
         '''
-        workflows = self.workflow_repository.get_workflow_list()
-        workflows_info = []
-        for workflow in workflows:
-            jobs = self.job_repository.get_job_list(workflow.uuid)
-            serialized_workflow = serialize_workflow(workflow, jobs)
-            workflows_info.append(serialized_workflow)
+        if limit is None:
+            limit = settings.WORKFLOW_LIST_PAGE_SIZE
+        if not 0 < limit <= settings.WORKFLOW_LIST_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {settings.WORKFLOW_LIST_MAX_PAGE_SIZE}")
+
+        workflows = self.workflow_repository.get_workflow_page(limit+1, decode_cursor(cursor) if cursor else None)
+        next_cursor = None
+        if len(workflows) > limit:
+            workflows = workflows[:limit]
+            next_cursor = encode_cursor(workflows[-1])
+
+        if include_jobs:
+            job_lists = self.job_repository.get_job_list_by_workflows([workflow.uuid for workflow in workflows])
+            results = [serialize_workflow(workflow, job_lists[workflow.uuid]) for workflow in workflows]
+        else:
+            results = [serialize_workflow_info(workflow) for workflow in workflows]
 
-        return workflows_info
+        return {'results': results, 'next_cursor': next_cursor}
     
-    @with_lock
-    def execute_workflow(self, workflow_uuid):
+    def execute_workflow(self, workflow_uuid, prewarm=None):
         '''
         실행 요청을 받은 Workflow를 캐싱, 실행 History 생성 
-        및 Job 의존성을 계산하여 Workflow 실행을 준비한다.
+        및 Job 의존성을 계산하여 Workflow 실행을 준비하고, 시작된 실행의 History UUID를 반환한다.
+        실행 상태는 History UUID 별로 관리되므로 같은 Workflow를 여러 번 동시에 실행할 수 있으며,
+        Workflow의 max_concurrent_runs에 도달했다면 ValueError를 발생시키며, 실행을 준비하다 실패하면 확보한 슬롯을 반납한다.
+        Workflow 정의는 캐시를 통해 읽으므로 정의가 바뀌지 않았다면 데이터베이스를 조회하지 않는다.
+        JOB_PRIORITY_DISPATCH가 참이면 Job마다 남은 임계 경로 길이에 따른 우선순위를 정해 실행을 요청한다.
+        prewarm이 참이면 루트 Job 이후에 실행될 Job들의 이미지를 병렬로 미리 받아둔다.
         '''
-        self.cache.delete(f"{workflow_uuid}")
-        self.cache.delete(f"{workflow_uuid}_status")
-        self.cache.delete(f"{workflow_uuid}_running_containers")
+        try:
+            definition = self.get_workflow_definition(workflow_uuid)
+        except ValueError:
+            return False
 
-        job_list = self.job_repository.get_job_list(workflow_uuid).values()
-        for job in job_list:
-            job['result'] = JOB_STATUS_WAITING
-            job['uuid'] = str(job['uuid'])
+        job_list = [{**job, 'uuid': str(job['uuid'])} for job in definition['workflow']['jobs']]
 
         if job_list:
-            job_list_json = json.dumps(list(job_list))
-            self.cache.set(workflow_uuid, job_list_json)            
-            self.cache.set(f"{workflow_uuid}_status", WORKFLOW_STATUS_RUNNING)
-            self.cache.set(f"{workflow_uuid}_running_containers", [])
-
-            history = self.history_repository.create_history(workflow_uuid)
-            job_dependency(workflow_uuid, history.uuid)
-
-            return True
+            history_uuid = str(uuid.uuid4())
+            max_concurrent_runs = definition['workflow'].get('max_concurrent_runs', 0)
+            if not self.run_state_repository.acquire_run_slot(workflow_uuid, history_uuid, max_concurrent_runs, settings.RUN_SLOT_STALE_AFTER):
+                self.metrics_repository.increase('workflow_runs_rejected')
+                raise ValueError(f"Workflow {workflow_uuid} already has {max_concurrent_runs} running executions")
+
+            plan = definition['plan']
+            try:
+                ranks, critical_path = self.estimate_path_ranks(job_list, plan)
+                priorities = rank_priorities(ranks, settings.JOB_PRIORITY_LEVELS) if settings.JOB_PRIORITY_DISPATCH else None
+                root_job_uuids = self.run_state_repository.create_run_state(history_uuid, job_list, plan, priorities)
+
+                self.history_repository.create_history(workflow_uuid, history_uuid, critical_path)
+                job_priorities = dict(zip(plan['job_uuids'], priorities or []))
+                for job_uuid in sorted(root_job_uuids, key=lambda job_uuid: job_priorities.get(job_uuid) or 0):
+                    job_execute(workflow_uuid, history_uuid, job_uuid, priority=job_priorities.get(job_uuid))
+            except Exception:
+                # 이미 요청된 Job은 실행 상태가 없으므로 수행되지 않는다.
+                self.run_state_repository.delete_run_state(history_uuid)
+                self.run_state_repository.release_run_slot(workflow_uuid, history_uuid)
+                self.history_repository.update_history_status(history_uuid, HISTORY_STATUS_FAIL)
+                raise
+
+            if prewarm is None:
+                prewarm = settings.DOCKER_IMAGE_PREWARM
+            if prewarm:
+                self.prewarm_images(job_list, root_job_uuids)
+
+            return history_uuid
         else:
             return False
+
+    def estimate_path_ranks(self, job_list, plan):
+        '''
+        실행 계획의 Job 별 예상 실행 시간으로 (Job 인덱스 별 남은 임계 경로 길이, 전체 임계 경로 길이)를 계산한다.
+        예상 실행 시간은 기록된 실행 시간의 이동 평균, Job에 선언된 estimated_duration,
+        JOB_DURATION_DEFAULT_ESTIMATE 순으로 사용한다. JOB_DURATION_PERCENTILE이 설정되어 있다면
+        Job 시도 기록의 실행 시간 분위수를 가장 먼저 사용한다.
+        '''
+        job_dict = {job['uuid']: job for job in job_list}
+        recorded_durations = self.job_duration_repository.get_durations(plan['job_uuids'])
+        if settings.JOB_DURATION_PERCENTILE:
+            percentiles = self.job_attempt_service.get_duration_percentiles(plan['job_uuids'], settings.JOB_DURATION_PERCENTILE)
+            recorded_durations = [
+                percentiles.get(job_uuid, recorded_duration)
+                for job_uuid, recorded_duration in zip(plan['job_uuids'], recorded_durations)
+            ]
+        durations = [
+            recorded_duration if recorded_duration is not None
+            else job_dict[job_uuid].get('estimated_duration') or settings.JOB_DURATION_DEFAULT_ESTIMATE
+            for job_uuid, recorded_duration in zip(plan['job_uuids'], recorded_durations)
+        ]
+        return compute_path_ranks(plan, durations)
+
+    def prewarm_images(self, job_list, root_job_uuids):
+        '''
+        도커 런타임 Job 중 루트 Job이 사용하지 않는 이미지들을 이미지 별 task로 나누어 여러 워커에서 병렬로 받아둔다.
+        '''
+        docker_jobs = [job for job in job_list if job.get('runtime', JOB_RUNTIME_DOCKER) == JOB_RUNTIME_DOCKER]
+        root_images = {job['image'] for job in docker_jobs if job['uuid'] in root_job_uuids}
+        images = {job['image'] for job in docker_jobs} - root_images
+        for image_name in images:
+            image_prewarm(image_name)
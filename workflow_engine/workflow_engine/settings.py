@@ -1,5 +1,5 @@
 from pathlib import Path
-import os, environ
+import os, socket, environ
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -125,7 +125,16 @@ CACHES = {
         'LOCATION': env('REDIS_LOCATION'),
         'TIMEOUT': None,
         'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient'
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SOCKET_CONNECT_TIMEOUT': 5,
+            'SOCKET_TIMEOUT': 5,
+            # 캐시, 엔진 상태, Lock이 모두 이 연결 풀을 공유한다.
+            'CONNECTION_POOL_KWARGS': {
+                'max_connections': int(env('REDIS_MAX_CONNECTIONS', default=50)),
+                'socket_keepalive': True,
+                'health_check_interval': 30,
+                'retry_on_timeout': True
+            }
         },
     },
 }
@@ -135,3 +144,107 @@ CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND')
 
 REDIS_HOST = env('REDIS_HOST')
 REDIS_PORT = int(env('REDIS_PORT'))
+
+# Docker configuration
+
+# 이미지 Pull 정책: always, if-not-present, never
+DOCKER_IMAGE_PULL_POLICY = env('DOCKER_IMAGE_PULL_POLICY', default='if-not-present')
+# 태그로 지정된 이미지를 워커에서 재확인 없이 재사용하는 시간(초). digest로 고정된 이미지는 만료되지 않는다.
+DOCKER_IMAGE_CACHE_TTL = int(env('DOCKER_IMAGE_CACHE_TTL', default=300))
+# Workflow 실행 시작 시 후행 Job들의 이미지를 미리 받아둘지 여부
+DOCKER_IMAGE_PREWARM = env.bool('DOCKER_IMAGE_PREWARM', default=False)
+# 웜 풀 모드로 실행할 이미지 목록. 러너 컨테이너를 재사용하므로 sleep 명령이 있는 이미지여야 한다.
+DOCKER_WARM_POOL_IMAGES = env.list('DOCKER_WARM_POOL_IMAGES', default=[])
+# 이미지 별로 워커 프로세스가 유지하는 대기 러너 컨테이너의 최대 수
+DOCKER_WARM_POOL_SIZE = int(env('DOCKER_WARM_POOL_SIZE', default=4))
+# 대기 러너 컨테이너를 제거하기까지의 유휴 시간(초)
+DOCKER_WARM_POOL_IDLE_TTL = int(env('DOCKER_WARM_POOL_IDLE_TTL', default=300))
+# 러너 컨테이너 하나가 수행할 수 있는 최대 Job 수
+DOCKER_WARM_POOL_MAX_USES = int(env('DOCKER_WARM_POOL_MAX_USES', default=100))
+# 컨테이너 감시 방식: blocking(워커가 컨테이너 종료까지 대기), watcher(watch_containers 프로세스가 종료를 감시)
+CONTAINER_SUPERVISION_MODE = env('CONTAINER_SUPERVISION_MODE', default='blocking')
+
+# Job retry configuration
+
+# 재시도 backoff 대기 시간의 상한(초)
+JOB_RETRY_MAX_DELAY = int(env('JOB_RETRY_MAX_DELAY', default=300))
+
+# Workflow list configuration
+
+# Workflow 목록 조회 시 한 페이지의 기본 크기와 최대 크기
+WORKFLOW_LIST_PAGE_SIZE = int(env('WORKFLOW_LIST_PAGE_SIZE', default=100))
+WORKFLOW_LIST_MAX_PAGE_SIZE = int(env('WORKFLOW_LIST_MAX_PAGE_SIZE', default=1000))
+
+# Workflow definition cache configuration
+
+# 직렬화된 Workflow 정의를 캐시에 유지하는 시간(초)
+WORKFLOW_DEFINITION_CACHE_TTL = int(env('WORKFLOW_DEFINITION_CACHE_TTL', default=3600))
+
+# Workflow run configuration
+
+# 종료된 실행의 상태를 Redis에 남겨두는 시간(초)
+RUN_STATE_RETENTION = int(env('RUN_STATE_RETENTION', default=3600))
+# 이 시간(초)보다 오래 반납되지 않은 동시 실행 슬롯은 비정상 종료된 실행으로 보고 회수한다.
+RUN_SLOT_STALE_AFTER = int(env('RUN_SLOT_STALE_AFTER', default=86400))
+
+# Job runtime configuration
+
+# Job에 지정할 수 있는 런타임 목록: docker, subprocess. subprocess 런타임은 워커 호스트에서 명령을 직접 실행하므로 신뢰할 수 있는 Job에만 허용한다.
+JOB_RUNTIMES_ENABLED = env.list('JOB_RUNTIMES_ENABLED', default=['docker'])
+
+# Job priority dispatch configuration
+
+# 준비된 Job을 남은 임계 경로 길이에 따른 우선순위로 실행 요청할지 여부
+JOB_PRIORITY_DISPATCH = env.bool('JOB_PRIORITY_DISPATCH', default=True)
+# task 우선순위 단계 수. Redis 브로커는 0이 가장 높은 우선순위이다.
+JOB_PRIORITY_LEVELS = 10
+CELERY_BROKER_TRANSPORT_OPTIONS = {'priority_steps': list(range(JOB_PRIORITY_LEVELS)), 'queue_order_strategy': 'priority'}
+# 워커가 미리 가져가는 task 수의 배수. 크면 우선순위가 낮은 task가 먼저 예약되어 우선순위가 무력화된다.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(env('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1))
+# 실행 기록과 선언된 예상 실행 시간이 모두 없는 Job의 예상 실행 시간(초)
+JOB_DURATION_DEFAULT_ESTIMATE = float(env('JOB_DURATION_DEFAULT_ESTIMATE', default=1.0))
+# Job 실행 시간 이동 평균의 평활 계수(0~1). 클수록 최근 실행 시간을 크게 반영한다.
+JOB_DURATION_SMOOTHING = float(env('JOB_DURATION_SMOOTHING', default=0.3))
+# 0보다 크면 Job 시도 기록에서 최근 성공한 실행 시간의 이 분위수(0~1)를 이동 평균보다 먼저 예상 실행 시간으로 사용한다
+JOB_DURATION_PERCENTILE = float(env('JOB_DURATION_PERCENTILE', default=0))
+
+# Worker resource admission configuration
+
+# 같은 도커 호스트를 공유하는 워커들이 함께 사용하는 자원 풀 이름
+WORKER_RESOURCE_POOL = env('WORKER_RESOURCE_POOL', default=socket.gethostname())
+# 자원 풀에서 동시에 실행 중인 Job들이 선언한 CPU(코어)와 메모리(MB) 합계의 상한. 0이면 제한하지 않는다.
+WORKER_CPU_CAPACITY = float(env('WORKER_CPU_CAPACITY', default=os.cpu_count()))
+WORKER_MEMORY_CAPACITY = int(env('WORKER_MEMORY_CAPACITY', default=os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)))
+# 자원이 부족하여 미룬 Job을 다시 시도하기까지의 최소 대기 시간(초). 실제 대기 시간은 1~2배 사이에서 무작위로 정한다.
+JOB_ADMISSION_RETRY_DELAY = float(env('JOB_ADMISSION_RETRY_DELAY', default=1.0))
+# 반납되지 않은 자원 예약을 회수하기까지 Job timeout에 더하는 여유 시간(초)
+JOB_RESOURCE_LEASE_GRACE = int(env('JOB_RESOURCE_LEASE_GRACE', default=60))
+
+# Scheduler configuration
+
+# 스케줄러가 데이터베이스에서 변경된 Scheduling을 다시 읽는 간격(초). 새로 활성화된 Scheduling이 반영되기까지의 최대 지연이다.
+SCHEDULER_SYNC_INTERVAL = float(env('SCHEDULER_SYNC_INTERVAL', default=1.0))
+# 스케줄러가 한 번에 실행 처리하는 Scheduling의 최대 수
+SCHEDULER_BATCH_SIZE = int(env('SCHEDULER_BATCH_SIZE', default=1000))
+# 스케줄러 동작 방식: heap(하나의 프로세스가 메모리의 힙으로 실행 시각을 관리), tick(여러 프로세스가 주기적으로 데이터베이스를 조회)
+SCHEDULER_MODE = env('SCHEDULER_MODE', default='heap')
+# tick 모드에서 실행 시각이 된 Scheduling을 조회하는 간격(초)
+SCHEDULER_TICK_INTERVAL = float(env('SCHEDULER_TICK_INTERVAL', default=0.5))
+# Workflow 실행 요청 task 하나에 담는 Scheduling 실행의 최대 수
+SCHEDULER_DISPATCH_CHUNK_SIZE = int(env('SCHEDULER_DISPATCH_CHUNK_SIZE', default=50))
+# cron, 실행 시각 리스트 Scheduling에 다음 실행 시각 이후로 미리 계산하여 저장해 두는 실행 시각의 수
+SCHEDULER_PRECOMPUTED_FIRE_TIMES = int(env('SCHEDULER_PRECOMPUTED_FIRE_TIMES', default=10))
+# 다음 실행 시각보다 이 시간(초) 이상 늦어진 Scheduling은 misfire_policy에 따라 처리한다
+SCHEDULER_MISFIRE_GRACE_TIME = float(env('SCHEDULER_MISFIRE_GRACE_TIME', default=60))
+# 모든 스케줄러가 늦어진 Scheduling을 따라잡으며 실행하는 초당 최대 Workflow 실행 수(0은 무제한)
+SCHEDULER_CATCHUP_RATE = float(env('SCHEDULER_CATCHUP_RATE', default=10))
+# 따라잡기 속도 제한에서 한 번에 실행할 수 있는 최대 Workflow 실행 수
+SCHEDULER_CATCHUP_BURST = int(env('SCHEDULER_CATCHUP_BURST', default=100))
+
+# Job attempt history configuration
+# Job 시도 기록을 데이터베이스에 한 번에 저장하는 최대 수. 버퍼에 이만큼 쌓이면 곧바로 저장한다.
+JOB_ATTEMPT_FLUSH_SIZE = int(env('JOB_ATTEMPT_FLUSH_SIZE', default=500))
+# 버퍼에 쌓인 Job 시도 기록을 저장하기까지 기다리는 최대 시간(초)
+JOB_ATTEMPT_FLUSH_INTERVAL = int(env('JOB_ATTEMPT_FLUSH_INTERVAL', default=5))
+# Job 별 통계 계산에 사용하는 최근 시도 기록의 수
+JOB_ATTEMPT_STATS_SAMPLE = int(env('JOB_ATTEMPT_STATS_SAMPLE', default=100))